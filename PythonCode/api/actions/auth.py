@@ -1,21 +1,29 @@
-from typing import Union
+import asyncio
+from logging import getLogger
+from typing import Optional, Union
 from uuid import UUID
 
-from fastapi import Depends
+from fastapi import Depends, Query
 from fastapi import HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt
 from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-import settings
+from api.models import TokenPrincipal
+from cache import auth_user_cache, token_version_cache
 from db.dals import UserDAL
 from db.models import User
-from db.session import get_db
-from hashing import Hasher
+from db.session import async_session, get_db
+from hashing import Hasher, HashingPoolBusy
+from sequrity import TOKEN_CLAIMS_VERSION, decode_access_token
+
+logger = getLogger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login/token", auto_error=False)
+
+_password_rehash_tasks = set()
 
 
 async def _get_user_by_email_for_auth(email: str, session: AsyncSession, ):
@@ -28,17 +36,50 @@ async def _get_user_by_email_for_auth(email: str, session: AsyncSession, ):
             return user
 
 
+async def _get_token_version(user_id: UUID, session: AsyncSession):
+    async with session.begin():
+        user_dal = UserDAL(session)
+        return await user_dal.get_token_version(user_id=user_id)
+
+
 async def authenticate_user(
         email: str, password: str, roles: str, name: str, surname: str, user_id: UUID, db: AsyncSession
 ) -> Union[User, None]:
     user = await _get_user_by_email_for_auth(email=email, session=db)
     if user is None:
         return
-    if not Hasher.verify_password(password, user.hashed_password):
+    if not await Hasher.verify_password_async(password, user.hashed_password):
         return
+    if Hasher.needs_rehash(user.hashed_password):
+        _schedule_password_rehash(user.user_id, password, user.hashed_password)
     return user
 
 
+def _schedule_password_rehash(user_id: UUID, password: str, old_hashed_password: str):
+    # Keep a reference so the task is not garbage collected before it finishes.
+    task = asyncio.create_task(_rehash_password(user_id, password, old_hashed_password))
+    _password_rehash_tasks.add(task)
+    task.add_done_callback(_password_rehash_tasks.discard)
+
+
+async def _rehash_password(user_id: UUID, password: str, old_hashed_password: str):
+    # Runs after the login response; on failure the hash is simply migrated on a later login.
+    try:
+        hashed_password = await Hasher.get_password_hash_async(password)
+        async with async_session() as session:
+            async with session.begin():
+                user_dal = UserDAL(session)
+                await user_dal.update_password_hash(
+                    user_id=user_id,
+                    old_hashed_password=old_hashed_password,
+                    hashed_password=hashed_password,
+                )
+    except HashingPoolBusy:
+        pass
+    except Exception:
+        logger.exception("Rehashing the password of user %s failed", user_id)
+
+
 async def get_current_user_from_token(
         token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
 ):
@@ -47,15 +88,73 @@ async def get_current_user_from_token(
         detail="Could not validate credentials",
     )
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_access_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = await _get_user_by_email_for_auth(email=email, session=db)
+    user = auth_user_cache.get(email)
     if user is None:
-        raise credentials_exception
+        user = await _get_user_by_email_for_auth(email=email, session=db)
+        if user is None:
+            raise credentials_exception
+        auth_user_cache.set(email, user)
     return user
+
+
+async def get_current_principal(
+        token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+) -> TokenPrincipal:
+    # Authorizes from the verified token claims. The only state consulted is the
+    # user's token version, cached in-process, so steady-state requests run no query.
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+    )
+    try:
+        payload = decode_access_token(token)
+    except JWTError:
+        raise credentials_exception
+    if payload.get("sub") is None:
+        raise credentials_exception
+    if payload.get("cv") != TOKEN_CLAIMS_VERSION:
+        # Tokens issued before the claims existed still work, through the user lookup.
+        user = await get_current_user_from_token(token, db)
+        return TokenPrincipal(
+            user_id=user.user_id, email=user.email, roles=user.roles, token_version=user.token_version
+        )
+    try:
+        principal = TokenPrincipal(
+            user_id=payload["user_id"], email=payload["sub"], roles=payload["roles"], token_version=payload["tv"]
+        )
+    except (KeyError, ValueError):
+        raise credentials_exception
+    cache_key = str(principal.user_id)
+    current_version = token_version_cache.get(cache_key, default=False)
+    if current_version is False:
+        # Always the primary, a lagging replica would still accept a revoked token.
+        async with async_session() as session:
+            row = await _get_token_version(principal.user_id, session)
+        current_version = row.token_version if row is not None and row.is_active else None
+        token_version_cache.set(cache_key, current_version)
+    if current_version != principal.token_version:
+        raise credentials_exception
+    return principal
+
+
+async def get_stream_principal(
+        token: Optional[str] = Depends(optional_oauth2_scheme),
+        access_token: Optional[str] = Query(None, description="Access token, for clients that cannot set headers"),
+        db: AsyncSession = Depends(get_db),
+) -> TokenPrincipal:
+    # Browser EventSource cannot send an Authorization header, so streams also
+    # take the token from the query string.
+    token = token or access_token
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await get_current_principal(token, db)
@@ -0,0 +1,75 @@
+from typing import Optional, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy.orm import sessionmaker
+
+import settings
+from db.dals import UserDAL
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+class BlobChunkMissing(Exception):
+    pass
+
+
+async def _get_doc_article_meta(article_id: UUID, db):
+    async with db as session:
+        async with session.begin():
+            user_dal = UserDAL(session)
+            meta = await user_dal.get_doc_article_meta(article_id=article_id)
+            if meta is not None:
+                return meta
+
+
+async def _stream_doc_article(session_factory: sessionmaker, sha256: str, start: int, end: int):
+    # Each chunk uses its own short session so a slow client does not pin a
+    # pooled connection for the whole download. They all come from the database
+    # the metadata was read from, another replica may not have the blob yet.
+    offset = start
+    while offset <= end:
+        length = min(settings.DOWNLOAD_CHUNK_SIZE, end - offset + 1)
+        async with session_factory() as session:
+            user_dal = UserDAL(session)
+            chunk = await user_dal.get_doc_article_chunk(sha256=sha256, offset=offset, length=length)
+        if not chunk:
+            # Content-Length is already out, ending quietly would pass off a truncated PDF as complete.
+            raise BlobChunkMissing(f"Article blob {sha256} ended at byte {offset} of {end + 1}")
+        yield chunk
+        offset += len(chunk)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def _is_digits(value: str) -> bool:
+    return value.isascii() and value.isdigit()
+
+
+def parse_byte_range(range_header: Optional[str], size: int) -> Union[Tuple[int, int], None]:
+    # Only a single byte range is served; anything we cannot parse is ignored and
+    # answered with the full body, as RFC 9110 allows.
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    first, dash, last = range_header[len("bytes="):].strip().partition("-")
+    # Plain ASCII digits only, int() would also take signs, blanks and underscores.
+    if not dash or not (first or last) or not all(_is_digits(part) for part in (first, last) if part):
+        return None
+    if first == "":
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if start > end:
+        return None
+    return start, min(end, size - 1)
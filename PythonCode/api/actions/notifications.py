@@ -0,0 +1,36 @@
+import asyncio
+import json
+from uuid import UUID
+
+import settings
+from db.dals import UserDAL
+from db.session import async_session
+from notification_broker import notification_broker, notification_data
+
+
+async def _get_streamed_notification(notification_id: UUID):
+    # Read from the primary, a replica may not have the row yet when the NOTIFY arrives.
+    async with async_session() as session:
+        async with session.begin():
+            user_dal = UserDAL(session)
+            return await user_dal.get_notification(notification_id=notification_id)
+
+
+async def _stream_notifications(user_id: str):
+    # Server-sent events; Starlette cancels the generator when the client goes
+    # away, which also drops the subscription.
+    with notification_broker.subscribe(user_id) as queue:
+        # Sent once subscribed, so the client can fetch what it missed before that point.
+        yield "event: ready\ndata: {}\n\n"
+        while True:
+            try:
+                payload = await asyncio.wait_for(queue.get(), settings.NOTIFICATION_STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                # A comment line, keeps proxies from closing an idle stream.
+                yield ": keepalive\n\n"
+                continue
+            notification = await _get_streamed_notification(UUID(json.loads(payload)["id"]))
+            if notification is None:
+                # Deleted before the stream got to it.
+                continue
+            yield f"event: notification\nid: {notification.id}\ndata: {notification_data(notification)}\n\n"
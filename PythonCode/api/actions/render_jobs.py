@@ -0,0 +1,132 @@
+import asyncio
+from logging import getLogger
+from typing import Optional
+from uuid import UUID
+
+import settings
+from db.dals import UserDAL
+from db.models import ArticleRenderStatus
+from db.session import async_session
+from rendering import ARTICLE_FIELDS, RenderPoolBusy, render_pool
+
+logger = getLogger(__name__)
+
+
+async def _set_article_render_status(article_id: UUID, render_status: str, doc_article=None, render_error=None):
+    async with async_session() as session:
+        async with session.begin():
+            user_dal = UserDAL(session)
+            await user_dal.update_article_render_status(
+                article_id=article_id,
+                render_status=render_status,
+                doc_article=doc_article,
+                render_error=render_error,
+            )
+
+
+async def _claim_article_render_job():
+    async with async_session() as session:
+        async with session.begin():
+            user_dal = UserDAL(session)
+            return await user_dal.claim_article_render_job(fields=ARTICLE_FIELDS)
+
+
+async def _release_article_render_jobs(article_ids: list):
+    async with async_session() as session:
+        async with session.begin():
+            user_dal = UserDAL(session)
+            await user_dal.release_article_render_jobs(article_ids=article_ids)
+
+
+async def _requeue_stale_article_render_jobs() -> int:
+    async with async_session() as session:
+        async with session.begin():
+            user_dal = UserDAL(session)
+            return await user_dal.requeue_stale_article_render_jobs(
+                stale_seconds=settings.RENDER_JOB_STALE_SECONDS,
+                max_attempts=settings.RENDER_JOB_MAX_ATTEMPTS,
+            )
+
+
+class ArticleRenderWorker:
+    # Render jobs live in the article table, not in memory: every worker process
+    # claims queued rows while it has a free render slot, so jobs survive
+    # restarts and spread over all processes. A job is only marked rendering
+    # once claimed, which happens when the pool can start it right away.
+    def __init__(self):
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._jobs = {}
+        # Claimed jobs whose task has not called render_pool.render() yet.
+        self._starting = 0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def wake(self):
+        # Picks up a job queued by this process without waiting for the next poll.
+        self._wakeup.set()
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        jobs = list(self._jobs.values())
+        for task in self._jobs:
+            task.cancel()
+        await asyncio.gather(self._task, *self._jobs, return_exceptions=True)
+        self._task = None
+        if jobs:
+            await _release_article_render_jobs(jobs)
+
+    def _has_free_slot(self) -> bool:
+        return render_pool.pending + self._starting < render_pool.max_concurrency
+
+    async def _run(self):
+        while True:
+            try:
+                requeued = await _requeue_stale_article_render_jobs()
+                if requeued:
+                    logger.warning("Requeued %s stale article render jobs", requeued)
+                while self._has_free_slot():
+                    job = await _claim_article_render_job()
+                    if job is None:
+                        break
+                    self._starting += 1
+                    task = asyncio.create_task(self._render(job))
+                    self._jobs[task] = job.article_id
+                    task.add_done_callback(self._job_done)
+            except Exception:
+                logger.exception("Claiming article render jobs failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.RENDER_JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def _job_done(self, task: asyncio.Task):
+        self._jobs.pop(task, None)
+        # A slot just freed up, look for the next job.
+        self._wakeup.set()
+
+    async def _render(self, job):
+        fields = {name: getattr(job, name) for name in ARTICLE_FIELDS}
+        # render() counts itself as pending before it first yields, hand the job over in the same step.
+        self._starting -= 1
+        try:
+            doc_article = await render_pool.render(fields)
+        except RenderPoolBusy:
+            # Synchronous renders took the slot in the meantime, try again later.
+            await _release_article_render_jobs([job.article_id])
+            return
+        except Exception as err:
+            logger.exception("Rendering article %s failed", job.article_id)
+            await _set_article_render_status(
+                job.article_id, ArticleRenderStatus.FAILED, render_error=str(err) or err.__class__.__name__
+            )
+            return
+        await _set_article_render_status(job.article_id, ArticleRenderStatus.DONE, doc_article=doc_article)
+
+
+article_render_worker = ArticleRenderWorker()
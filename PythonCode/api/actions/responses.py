@@ -0,0 +1,25 @@
+import hashlib
+
+from fastapi import Request, Response
+
+from api.actions.download import etag_matches
+from cache import response_cache, response_generation
+
+
+async def _cached_json_response(request: Request, scope: str, key: tuple, load) -> Response:
+    # Serves the JSON body from the response cache, running load() for the encoded
+    # body only on a miss. Clients revalidate every time and get a 304 while the
+    # data is unchanged.
+    cache_key = (scope,) + key
+    entry = response_cache.get(cache_key)
+    if entry is None:
+        generation = response_generation(scope)
+        body = await load()
+        entry = (scope, f'"{hashlib.sha256(body).hexdigest()[:32]}"', body)
+        if response_generation(scope) == generation:
+            response_cache.set(cache_key, entry)
+    _, etag, body = entry
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
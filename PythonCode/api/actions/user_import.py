@@ -0,0 +1,143 @@
+import asyncio
+import csv
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+import settings
+from api.models import UserCreate, UserImportError, UserImportResult
+from db.dals import UserDAL
+from db.models import PortalRole
+from hashing import Hasher, HashingPoolBusy, hashing_pool
+
+USER_IMPORT_COLUMNS = ("name", "surname", "age", "email", "password")
+USER_IMPORT_CONTENT_TYPES = ("text/csv", "application/x-ndjson")
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]):
+    # Splits the request body into lines as it arrives, without buffering all of it.
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+def _validation_detail(err: Exception) -> str:
+    if isinstance(err, HTTPException):
+        return str(err.detail)
+    if isinstance(err, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in err.errors())
+    return str(err)
+
+
+async def _iter_import_rows(chunks: AsyncIterator[bytes], is_csv: bool):
+    # Yields (row number, fields or None, error) for every non-blank line. Rows
+    # are numbered by line, so a CSV header is line 1.
+    header: Optional[list] = None
+    number = 0
+    async for line in _iter_lines(chunks):
+        number += 1
+        try:
+            text = line.decode("utf-8").strip()
+            if not text:
+                continue
+            if not is_csv:
+                fields = json.loads(text)
+                if isinstance(fields, dict):
+                    yield number, fields, None
+                else:
+                    yield number, None, "Expected a JSON object"
+                continue
+            # Fields spanning lines are not supported, none of the user columns needs them.
+            values = next(csv.reader([text]))
+            if header is None:
+                header = [value.strip() for value in values]
+                missing = [column for column in USER_IMPORT_COLUMNS if column not in header]
+                if missing:
+                    raise HTTPException(status_code=422, detail=f"CSV header lacks columns: {', '.join(missing)}")
+                continue
+            yield number, dict(zip(header, values)), None
+        except (UnicodeDecodeError, ValueError, csv.Error) as err:
+            yield number, None, str(err)
+
+
+async def _hash_for_import(password: str, semaphore: asyncio.Semaphore) -> str:
+    # The semaphore keeps the import from filling the pool's queue, so logins
+    # only ever wait behind the hashes already running.
+    async with semaphore:
+        while True:
+            try:
+                return await Hasher.get_password_hash_async(password)
+            except HashingPoolBusy:
+                await asyncio.sleep(0.1)
+
+
+async def _insert_import_batch(batch: list, session, semaphore: asyncio.Semaphore, errors: list) -> int:
+    hashed_passwords = await asyncio.gather(*(_hash_for_import(user.password, semaphore) for _, user in batch))
+    async with session.begin():
+        user_dal = UserDAL(session)
+        created = await user_dal.create_users([
+            {
+                "name": user.name,
+                "surname": user.surname,
+                "age": user.age,
+                "email": user.email,
+                "hashed_password": hashed_password,
+                "roles": PortalRole.ROLE_PORTAL_USER,
+            }
+            for (_, user), hashed_password in zip(batch, hashed_passwords)
+        ])
+    created_emails = {row.email for row in created}
+    for number, user in batch:
+        if user.email not in created_emails:
+            errors.append(UserImportError(row=number, email=user.email, detail="Email is already registered"))
+    return len(created)
+
+
+async def _import_users(chunks: AsyncIterator[bytes], is_csv: bool, db) -> UserImportResult:
+    # Rows are validated while the body streams in, then hashed on the hashing
+    # pool and inserted a batch at a time, each batch in its own transaction.
+    errors = []
+    seen_emails = set()
+    semaphore = asyncio.Semaphore(hashing_pool.max_workers)
+    batch = []
+    created = 0
+    rows = 0
+    async with db as session:
+        async for number, fields, error in _iter_import_rows(chunks, is_csv):
+            rows += 1
+            if rows > settings.USER_IMPORT_MAX_ROWS:
+                errors.append(UserImportError(
+                    row=number, email=None,
+                    detail=f"Import is limited to {settings.USER_IMPORT_MAX_ROWS} rows, the rest was not read",
+                ))
+                break
+            if error is not None:
+                errors.append(UserImportError(row=number, email=None, detail=error))
+                continue
+            try:
+                user = UserCreate(**{column: fields.get(column) for column in USER_IMPORT_COLUMNS})
+            except (HTTPException, ValidationError, TypeError) as err:
+                email = fields.get("email") if isinstance(fields.get("email"), str) else None
+                errors.append(UserImportError(row=number, email=email, detail=_validation_detail(err)))
+                continue
+            if user.email in seen_emails:
+                errors.append(
+                    UserImportError(row=number, email=user.email, detail="Email appears earlier in the import")
+                )
+                continue
+            seen_emails.add(user.email)
+            batch.append((number, user))
+            if len(batch) >= settings.BULK_INSERT_BATCH_SIZE:
+                created += await _insert_import_batch(batch, session, semaphore, errors)
+                batch = []
+        if batch:
+            created += await _insert_import_batch(batch, session, semaphore, errors)
+    errors.sort(key=lambda error: error.row)
+    return UserImportResult(created=created, failed=len(errors), errors=errors)
@@ -2,27 +2,42 @@ import shutil
 from logging import getLogger
 from typing import Annotated, List, Optional
 from uuid import UUID
-from fastapi.responses import FileResponse
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from urllib.parse import quote
+from fastapi.responses import Response, StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.actions.auth import get_current_user_from_token
+import settings
+from api.actions.auth import get_current_principal, get_stream_principal
+from api.actions.download import _get_doc_article_meta, _stream_doc_article, etag_matches, parse_byte_range, \
+    RangeNotSatisfiable
+from api.actions.notifications import _stream_notifications
+from api.actions.responses import _cached_json_response
+from api.actions.user_import import _import_users, USER_IMPORT_CONTENT_TYPES
 from api.actions.user import _create_new_user, _delete_user, _get_user_by_id, _update_user, _get_all_users, \
     _create_new_manager, _create_new_event, \
     _get_all_events, _update_event, _get_event_by_id, _delete_event, check_user_event_permissions, \
     _create_new_application, _create_new_comment, _update_application, \
-    _create_new_notification, _get_notification_by_user_id, _update_notifications, _get_comment_by_application_id, \
-    _get_application_by_user_id, \
+    _create_new_notification, _create_new_notifications, _get_notification_by_user_id, _update_notifications, \
+    _get_comment_by_application_id, _get_application_by_user_id, \
     _get_new_applications, _get_old_applications, _delete_notifications, _get_application_by_application_id, \
-    _create_new_article, _get_articles, _get_doc_articles, _get_article_by_user_id, _get_article_by_article_id
+    _create_new_article, _get_articles, _get_article_by_user_id, _get_article_by_article_id, \
+    _create_article_render_job, _get_article_render_job, _update_applications_status, \
+    _search_articles, _search_users
 from api.models import DeleteEventResponse
 from api.models import UserCreate, ShowUser, DeleteUserResponse, \
     UpdateUserNameRequest, EventCreate, ShowEvent, UpdateEventRequest, \
     ApplicationCreate, ShowApplication, CommentCreate, ShowComment, UpdateStatusApplication, NotificationCreate, \
-    ArticleCreate, ShowArticle
+    NotificationBulkCreate, NotificationBulkCreated, ApplicationStatusBatch, ApplicationStatusBatchResult, \
+    ArticleCreate, ShowArticle, ShowArticleJob, parse_article_fields, parse_search_cursor, TokenPrincipal, \
+    UserImportResult, UserMatch
+from cache import ARTICLES_RESPONSES, EVENTS_RESPONSES
 from db.models import User, PortalRole
-from db.session import get_db
+from db.session import get_db, get_primary_db, read_sessionmaker
+from hashing import HashingPoolBusy
+from api.actions.render_jobs import article_render_worker
+from rendering import RenderPoolBusy
 
 logger = getLogger(__name__)
 
@@ -33,6 +48,30 @@ user_router = APIRouter()
 async def create_user(body: UserCreate, db: AsyncSession = Depends(get_db)) -> ShowUser:
     try:
         return await _create_new_user(body, db)
+    except HashingPoolBusy as err:
+        logger.warning(err)
+        raise HTTPException(status_code=503, detail=str(err), headers={"Retry-After": "1"})
+    except IntegrityError as err:
+        logger.error(err)
+        raise HTTPException(status_code=503, detail=f"Database error: {err}")
+
+
+@user_router.post("/import")
+async def import_users(
+        request: Request,
+        db: AsyncSession = Depends(get_db),
+        current_user: TokenPrincipal = Depends(get_current_principal)
+) -> UserImportResult:
+    # The body is a CSV file with a header row or NDJSON, one user object per line.
+    if current_user.roles not in (PortalRole.ROLE_PORTAL_ADMIN, PortalRole.ROLE_PORTAL_SUPERADMIN):
+        raise HTTPException(status_code=403, detail="Forbidden.")
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in USER_IMPORT_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=415, detail=f"Expected one of: {', '.join(USER_IMPORT_CONTENT_TYPES)}"
+        )
+    try:
+        return await _import_users(request.stream(), content_type == "text/csv", db)
     except IntegrityError as err:
         logger.error(err)
         raise HTTPException(status_code=503, detail=f"Database error: {err}")
@@ -54,9 +93,37 @@ async def create_article(body: ArticleCreate = Form(...), db: AsyncSession = Dep
     # res.append(image)
     try:
         return await _create_new_article(body, db)
+    except RenderPoolBusy as err:
+        logger.warning(err)
+        raise HTTPException(status_code=503, detail=str(err), headers={"Retry-After": "5"})
+    except IntegrityError as err:
+        logger.error(err)
+        raise HTTPException(status_code=503, detail=f"Database error: {err}")
+
+
+@user_router.post("/create_article_job", status_code=202)
+async def create_article_job(body: ArticleCreate = Form(...), db: AsyncSession = Depends(get_db)) -> ShowArticleJob:
+    try:
+        job = await _create_article_render_job(body, db)
+    except RenderPoolBusy as err:
+        logger.warning(err)
+        raise HTTPException(status_code=503, detail=str(err), headers={"Retry-After": "5"})
     except IntegrityError as err:
         logger.error(err)
         raise HTTPException(status_code=503, detail=f"Database error: {err}")
+    article_render_worker.wake()
+    return job
+
+
+@user_router.get("/article_job")
+async def get_article_job(
+        job_id: UUID,
+        db: AsyncSession = Depends(get_primary_db),
+) -> ShowArticleJob:
+    job = await _get_article_render_job(job_id, db)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Article job with id {job_id} not found.")
+    return job
 
 
 @user_router.post("/create_event")
@@ -72,6 +139,9 @@ async def create_event(body: EventCreate, db: AsyncSession = Depends(get_db)) ->
 async def create_manager(body: UserCreate, db: AsyncSession = Depends(get_db)) -> ShowUser:
     try:
         return await _create_new_manager(body, db)
+    except HashingPoolBusy as err:
+        logger.warning(err)
+        raise HTTPException(status_code=503, detail=str(err), headers={"Retry-After": "1"})
     except IntegrityError as err:
         logger.error(err)
         raise HTTPException(status_code=503, detail=f"Database error: {err}")
@@ -97,17 +167,65 @@ async def create_comment(body: CommentCreate, body1: NotificationCreate,
         raise HTTPException(status_code=503, detail=f"Database error: {err}")
 
 
+@user_router.post("/create_notifications")
+async def create_notifications(
+        body: NotificationBulkCreate,
+        db: AsyncSession = Depends(get_db),
+        current_user: TokenPrincipal = Depends(get_current_principal)
+) -> NotificationBulkCreated:
+    if current_user.roles not in (
+            PortalRole.ROLE_PORTAL_ADMIN,
+            PortalRole.ROLE_PORTAL_MANAGER,
+            PortalRole.ROLE_PORTAL_SUPERADMIN,
+    ):
+        raise HTTPException(status_code=403, detail="Forbidden.")
+    try:
+        return await _create_new_notifications(body, db)
+    except IntegrityError as err:
+        logger.error(err)
+        raise HTTPException(status_code=503, detail=f"Database error: {err}")
+
+
 @user_router.get("/file/download")
-async def download_file(article_id: UUID, db: AsyncSession = Depends(get_db)):
-    await _get_doc_articles(db, article_id)
-    return FileResponse(path='download_images_article/image2.pdf', filename='СТАТЬЯ.pdf', media_type='multipart/form-data')
+async def download_file(article_id: UUID, request: Request):
+    # The metadata and every chunk are read from the same replica.
+    session_factory = read_sessionmaker()
+    meta = await _get_doc_article_meta(article_id, session_factory())
+    if meta is None:
+        raise HTTPException(status_code=404, detail=f"PDF for article with id {article_id} not found.")
+    etag = f'"{meta.sha256}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f"attachment; filename*=utf-8''{quote('СТАТЬЯ.pdf')}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range == etag:
+        try:
+            byte_range = parse_byte_range(request.headers.get("range"), meta.size)
+        except RangeNotSatisfiable:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{meta.size}"})
+    status_code = 200
+    start, end = 0, meta.size - 1
+    if byte_range is not None:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{meta.size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _stream_doc_article(session_factory, meta.sha256, start, end), status_code=status_code, media_type="application/pdf",
+        headers=headers,
+    )
 
 
 @user_router.delete("/delete", response_model=DeleteUserResponse)
 async def delete_user(
         user_id: UUID,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_user_from_token),
+        current_user: TokenPrincipal = Depends(get_current_principal),
 ) -> DeleteUserResponse:
     user_for_deletion = await _get_user_by_id(user_id, db)
     if user_for_deletion is None:
@@ -130,7 +248,7 @@ async def delete_user(
 async def delete_event(
         event_id: UUID,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_user_from_token),
+        current_user: TokenPrincipal = Depends(get_current_principal),
 ) -> DeleteEventResponse:
     event_for_deletion = await _get_event_by_id(event_id, db)
     if event_for_deletion is None:
@@ -153,7 +271,7 @@ async def delete_event(
 async def get_user_by_id(
         user_id: UUID,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_user_from_token),
+        current_user: TokenPrincipal = Depends(get_current_principal),
 ) -> ShowUser:
     user = await _get_user_by_id(user_id, db)
     if user is None:
@@ -165,7 +283,7 @@ async def get_user_by_id(
 async def get_user_by_id(
         user_id: UUID,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_user_from_token),
+        current_user: TokenPrincipal = Depends(get_current_principal),
 ) -> ShowUser:
     user = await _get_user_by_id(user_id, db)
     if user is None:
@@ -230,53 +348,113 @@ async def get_article_by_article_id(
 
 @user_router.get("/this_old_application")
 async def get_old_applications(
+        limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+        after: Optional[UUID] = None,
         db: AsyncSession = Depends(get_db),
 ):
-    application = await _get_old_applications(db)
-    return application
+    application = await _get_old_applications(db, limit, after)
+    return Response(application, media_type="application/json")
 
 
 @user_router.get("/this_articles")
 async def get_articles(
+        request: Request,
+        limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+        after: Optional[UUID] = None,
+        fields: Optional[str] = Query(None, description="Comma separated article columns to return"),
+        summary: bool = True,
+        db: AsyncSession = Depends(get_primary_db),
+):
+    # Filled from the primary: a page read from a lagging replica right after a
+    # write would be cached until the next write, invalidation has already run.
+    article_fields = parse_article_fields(fields, summary)
+    return await _cached_json_response(
+        request, ARTICLES_RESPONSES, (limit, after, tuple(article_fields)),
+        lambda: _get_articles(db, limit, article_fields, after),
+    )
+
+
+@user_router.get("/search_articles")
+async def search_articles(
+        q: str = Query(..., min_length=1, max_length=256, description="Words or \"phrases\", in Russian or English"),
+        limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+        after: Optional[str] = None,
+        fields: Optional[str] = Query(None, description="Comma separated article columns to return"),
         db: AsyncSession = Depends(get_db),
 ):
-    articles = await _get_articles(db)
-    return articles
+    # Matches names, keywords and annotations; items carry their rank.
+    articles = await _search_articles(
+        db, q, limit, parse_search_cursor(after), parse_article_fields(fields, summary=True)
+    )
+    return Response(articles, media_type="application/json")
 
 
 @user_router.get("/this_new_application")
 async def get_new_applications(
+        limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+        after: Optional[UUID] = None,
         db: AsyncSession = Depends(get_db),
 ):
-    application = await _get_new_applications(db)
-    return application
+    application = await _get_new_applications(db, limit, after)
+    return Response(application, media_type="application/json")
+
+
+@user_router.get("/notifications/stream")
+async def stream_notifications(current_user: TokenPrincipal = Depends(get_stream_principal)):
+    # Pushes the caller's notifications as they are committed, replacing polling of /this_notification.
+    return StreamingResponse(
+        _stream_notifications(str(current_user.user_id)), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @user_router.get("/this_notification")
 async def get_notification_by_user_id(
         user_id: UUID,
+        limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+        after: Optional[UUID] = None,
         db: AsyncSession = Depends(get_db),
 ):
-    notification = await _get_notification_by_user_id(user_id, db)
+    notification = await _get_notification_by_user_id(user_id, db, limit, after)
     if notification is None:
         raise HTTPException(status_code=404, detail=f"Notification with user_id {user_id} not found.")
-    return notification
+    return Response(notification, media_type="application/json")
+
+
+@user_router.get("/search_users")
+async def search_users(
+        q: str = Query(..., min_length=1, max_length=256),
+        limit: int = Query(settings.USER_SEARCH_DEFAULT_LIMIT, ge=1, le=settings.USER_SEARCH_MAX_LIMIT),
+        db: AsyncSession = Depends(get_db),
+        current_user: TokenPrincipal = Depends(get_current_principal)
+) -> List[UserMatch]:
+    # Typeahead over names, surnames and emails of active users, closest matches first.
+    if current_user.roles not in (PortalRole.ROLE_PORTAL_ADMIN, PortalRole.ROLE_PORTAL_SUPERADMIN):
+        raise HTTPException(status_code=403, detail="Forbidden.")
+    return await _search_users(db, q, limit)
 
 
 @user_router.get("/all", )
 async def get_users(
+        limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+        after: Optional[UUID] = None,
         db: AsyncSession = Depends(get_db)
 ):
-    users = await _get_all_users(db)
-    return users
+    users = await _get_all_users(db, limit, after)
+    return Response(users, media_type="application/json")
 
 
 @user_router.get("/all_events", )
 async def get_events(
-        db: AsyncSession = Depends(get_db)
+        request: Request,
+        limit: int = Query(settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT),
+        after: Optional[UUID] = None,
+        db: AsyncSession = Depends(get_primary_db)
 ):
-    events = await _get_all_events(db)
-    return events
+    # Filled from the primary, like /this_articles.
+    return await _cached_json_response(
+        request, EVENTS_RESPONSES, (limit, after), lambda: _get_all_events(db, limit, after)
+    )
 
 
 @user_router.patch("/edit")
@@ -284,13 +462,10 @@ async def update_user_by_id(
         user_id: UUID,
         body: UpdateUserNameRequest,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_user_from_token)
+        current_user: TokenPrincipal = Depends(get_current_principal)
 ):
     if user_id != current_user.user_id:
-        if not (
-                PortalRole.ROLE_PORTAL_ADMIN,
-                PortalRole.ROLE_PORTAL_SUPERADMIN,
-        ):
+        if current_user.roles not in (PortalRole.ROLE_PORTAL_ADMIN, PortalRole.ROLE_PORTAL_SUPERADMIN):
             raise HTTPException(status_code=403, detail="Forbidden.")
     updated_user_id = await _update_user(
         name=body.name, surname=body.surname, email=body.email, session=db, user_id=user_id
@@ -302,7 +477,7 @@ async def update_event_by_id(
         event_id: UUID,
         body: UpdateEventRequest,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_user_from_token)
+        current_user: TokenPrincipal = Depends(get_current_principal)
 ):
     if event_id != current_user.user_id:
         if not (
@@ -340,14 +515,35 @@ async def update_application_by_user_id(
         body: UpdateStatusApplication,
         body1: NotificationCreate,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_user_from_token)
+        current_user: TokenPrincipal = Depends(get_current_principal)
 ):
-    if not (
-            current_user.roles == 'ROLE_PORTAL_ADMIN',
-            current_user.roles == 'ROLE_PORTAL_MANAGER'
+    if current_user.roles not in (
+            PortalRole.ROLE_PORTAL_ADMIN,
+            PortalRole.ROLE_PORTAL_MANAGER,
+            PortalRole.ROLE_PORTAL_SUPERADMIN,
     ):
         raise HTTPException(status_code=403, detail="Forbidden.")
     updated_application_status = await _update_application(
         id=id, status=body.status, session=db
     )
     notification = await _create_new_notification(body1, db)
+
+
+@user_router.patch("/edit_applications")
+async def update_applications_status(
+        body: ApplicationStatusBatch,
+        db: AsyncSession = Depends(get_db),
+        current_user: TokenPrincipal = Depends(get_current_principal)
+) -> ApplicationStatusBatchResult:
+    # Applies every status change and notifies each applicant in a single transaction.
+    if current_user.roles not in (
+            PortalRole.ROLE_PORTAL_ADMIN,
+            PortalRole.ROLE_PORTAL_MANAGER,
+            PortalRole.ROLE_PORTAL_SUPERADMIN,
+    ):
+        raise HTTPException(status_code=403, detail="Forbidden.")
+    try:
+        return await _update_applications_status(body, db)
+    except IntegrityError as err:
+        logger.error(err)
+        raise HTTPException(status_code=503, detail=f"Database error: {err}")
@@ -1,23 +1,30 @@
 from datetime import timedelta
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 import settings
 from api.actions.auth import authenticate_user, _get_user_by_email_for_auth
+from hashing import HashingPoolBusy
 from api.models import Token
-from sequrity import create_access_token
+from sequrity import create_access_token, access_token_claims, signing_keys, is_asymmetric
 from db.session import get_db
 
 login_router = APIRouter()
+well_known_router = APIRouter()
 
 
 @login_router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
 ):
-    user = await authenticate_user(form_data.username, form_data.password, form_data.roles, form_data.name, form_data.surname, form_data.user_id, db)
+    try:
+        user = await authenticate_user(form_data.username, form_data.password, form_data.roles, form_data.name, form_data.surname, form_data.user_id, db)
+    except HashingPoolBusy as err:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(err), headers={"Retry-After": "1"}
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -25,7 +32,16 @@ async def login_for_access_token(
         )
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email, "other_custom_data": [1, 2, 3, 4]},
+        data=access_token_claims(user),
         expires_delta=access_token_expires,
     )
     return {"access_token": access_token, "token_type": "bearer", "roles": user.roles, "name": user.name, "surname": user.surname,  "user_id": user.user_id}
+
+
+@well_known_router.get("/jwks.json")
+async def get_jwks(response: Response):
+    # Lets other services verify our tokens locally, without the secret or a call back here.
+    if not is_asymmetric():
+        return {"keys": []}
+    response.headers["Cache-Control"] = f"public, max-age={int(settings.JWT_KEYS_RELOAD_SECONDS)}"
+    return signing_keys.jwks()
@@ -0,0 +1,38 @@
+import asyncio
+
+from fastapi import APIRouter
+
+from cache import auth_user_cache, response_cache
+from hashing import hashing_pool
+from notification_broker import notification_broker
+from render_cache import render_cache
+from rendering import render_pool
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get("/render_cache")
+async def get_render_cache_stats():
+    stats = await asyncio.to_thread(render_cache.stats)
+    stats["renders_pending"] = render_pool.pending
+    return stats
+
+
+@metrics_router.get("/hashing")
+async def get_hashing_stats():
+    return hashing_pool.stats()
+
+
+@metrics_router.get("/auth_cache")
+async def get_auth_cache_stats():
+    return auth_user_cache.stats()
+
+
+@metrics_router.get("/response_cache")
+async def get_response_cache_stats():
+    return response_cache.stats()
+
+
+@metrics_router.get("/notifications")
+async def get_notification_stats():
+    return notification_broker.stats()
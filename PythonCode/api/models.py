@@ -1,13 +1,45 @@
 import re
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from fastapi import HTTPException, UploadFile
 from pydantic import BaseModel, EmailStr, validator, constr
 from sqlalchemy.dialects.postgresql import BYTEA
 
+import settings
+
 LETTER_MATCH_PATTERN = re.compile(r"^[a-яA-Яa-zA-Z\-]+$")
 
+ARTICLE_LIST_FIELDS = (
+    "article_id", "user_id", "article_name", "engl_article_name", "authors", "engl_authors", "author_city_first",
+    "author_city_second", "engl_author_city_first", "engl_author_city_second", "annotation", "keywords",
+    "engl_annotation", "engl_keywords", "introduction", "theory", "results", "conclusion", "thanks",
+    "list_of_sources", "doc_sha256", "render_status", "render_error",
+)
+ARTICLE_SUMMARY_FIELDS = ("article_id", "article_name", "engl_article_name", "authors", "keywords")
+
+
+def parse_search_cursor(after: Optional[str]) -> Optional[tuple]:
+    # Search pages are ordered by rank, so their cursor is "<rank>:<article_id>".
+    if after is None:
+        return None
+    rank, _, article_id = after.partition(":")
+    try:
+        return float(rank), uuid.UUID(article_id)
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid search cursor")
+
+
+def parse_article_fields(fields: Optional[str], summary: bool) -> list:
+    if fields is None:
+        return list(ARTICLE_SUMMARY_FIELDS if summary else ARTICLE_LIST_FIELDS)
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in ARTICLE_LIST_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown article fields: {', '.join(unknown)}")
+    # article_id is the pagination key, so it is always returned.
+    return ["article_id"] + [field for field in dict.fromkeys(requested) if field != "article_id"]
+
 
 class TunedModel(BaseModel):
     class Config:
@@ -23,6 +55,14 @@ class ShowUser(TunedModel):
     is_active: bool
 
 
+class UserMatch(TunedModel):
+    user_id: uuid.UUID
+    name: str
+    surname: str
+    email: str
+    roles: str
+
+
 class UserCreate(BaseModel):
     name: str
     surname: str
@@ -47,6 +87,18 @@ class UserCreate(BaseModel):
         return value
 
 
+class UserImportError(BaseModel):
+    row: int
+    email: Optional[str]
+    detail: str
+
+
+class UserImportResult(BaseModel):
+    created: int
+    failed: int
+    errors: List[UserImportError]
+
+
 class EventCreate (BaseModel):
     name: str
     content: str
@@ -97,6 +149,22 @@ class NotificationCreate(BaseModel):
     user_id: str
 
 
+class NotificationBulkCreate(BaseModel):
+    notifications: List[NotificationCreate]
+
+    @validator("notifications")
+    def validate_notifications(cls, value):
+        if len(value) > settings.BULK_MAX_ITEMS:
+            raise HTTPException(
+                status_code=422, detail=f"At most {settings.BULK_MAX_ITEMS} notifications per request"
+            )
+        return value
+
+
+class NotificationBulkCreated(BaseModel):
+    created: int
+
+
 class ShowNotification(TunedModel):
     application_id: uuid.UUID
     application_name: str
@@ -134,6 +202,12 @@ class ShowArticle(TunedModel):
     list_of_sources: str
 
 
+class ShowArticleJob(TunedModel):
+    job_id: uuid.UUID
+    status: str
+    error: Optional[str]
+
+
 class ShowApplication (TunedModel):
     id: uuid.UUID
     event_id: str
@@ -230,6 +304,37 @@ class UpdateStatusApplication(BaseModel):
     status: str
 
 
+class ApplicationStatusChange(BaseModel):
+    id: uuid.UUID
+    status: str
+
+
+class ApplicationStatusBatch(BaseModel):
+    applications: List[ApplicationStatusChange]
+
+    @validator("applications")
+    def validate_applications(cls, value):
+        if len(value) > settings.BULK_MAX_ITEMS:
+            raise HTTPException(
+                status_code=422, detail=f"At most {settings.BULK_MAX_ITEMS} applications per request"
+            )
+        if len({change.id for change in value}) != len(value):
+            raise HTTPException(status_code=422, detail="Each application may only appear once")
+        return value
+
+
+class ApplicationStatusResult(BaseModel):
+    id: uuid.UUID
+    status: str
+    updated: bool
+
+
+class ApplicationStatusBatchResult(BaseModel):
+    updated: int
+    notified: int
+    results: List[ApplicationStatusResult]
+
+
 class UpdateUserRequest(BaseModel):
     name: Optional[constr(min_length=1)]
     surname: Optional[constr(min_length=1)]
@@ -252,6 +357,13 @@ class UpdateUserRequest(BaseModel):
         return value
 
 
+class TokenPrincipal(BaseModel):
+    user_id: uuid.UUID
+    email: str
+    roles: str
+    token_version: int
+
+
 class Token(BaseModel):
     name: str
     surname: str
@@ -0,0 +1,61 @@
+"""Password verification latency per bcrypt cost, to choose BCRYPT_ROUNDS.
+
+Verifies run through the hashing pool with the given concurrency, as logins do.
+Run from the PythonCode directory:
+python benchmarks/bench_hashing.py [verifies] [concurrency] [target_p99_ms]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from passlib.context import CryptContext  # noqa: E402
+
+import settings  # noqa: E402
+from hashing import HashingPool  # noqa: E402
+
+COST_LEVELS = range(10, 15)
+
+
+async def bench(rounds: int, verifies: int, concurrency: int) -> list:
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    hashed_password = context.hash("correct horse battery staple")
+    pool = HashingPool(settings.HASH_POOL_WORKERS, max_queue_depth=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def verify():
+        async with semaphore:
+            start = time.perf_counter()
+            await pool.run(context.verify, "correct horse battery staple", hashed_password)
+            return time.perf_counter() - start
+
+    timings = await asyncio.gather(*(verify() for _ in range(verifies)))
+    return sorted(timings)
+
+
+async def main():
+    verifies = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    target_ms = float(sys.argv[3]) if len(sys.argv) > 3 else None
+    chosen = None
+    for rounds in COST_LEVELS:
+        timings = await bench(rounds, verifies, concurrency)
+        p99_ms = timings[int(len(timings) * 0.99) - 1] * 1000
+        print(
+            f"rounds {rounds}: median {statistics.median(timings) * 1000:.1f} ms, "
+            f"p99 {p99_ms:.1f} ms over {verifies} verifies, concurrency {concurrency}"
+        )
+        if target_ms is not None and p99_ms <= target_ms:
+            chosen = rounds
+    if target_ms is not None:
+        if chosen is None:
+            print(f"no cost level keeps p99 under {target_ms:.0f} ms")
+        else:
+            print(f"highest cost within {target_ms:.0f} ms p99: BCRYPT_ROUNDS={chosen}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
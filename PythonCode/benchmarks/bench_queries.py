@@ -0,0 +1,63 @@
+"""Per-query latency of literal-embedded SQL vs cacheable bound statements.
+
+Needs a migrated database at REAL_DATABASE_URL.
+Run from the PythonCode directory: python benchmarks/bench_queries.py [iterations]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+import settings  # noqa: E402
+from db.models import User  # noqa: E402
+
+
+def literal_query(user_id):
+    # What UserDAL used to send: a new SQL string for every value.
+    return text(f"SELECT * FROM users where user_id::text = '{user_id}'")
+
+
+def bound_query(user_id):
+    return select(User.__table__).where(User.user_id == user_id)
+
+
+async def bench(engine, build_query, iterations: int) -> list:
+    timings = []
+    async with engine.connect() as connection:
+        for _ in range(iterations):
+            query = build_query(uuid.uuid4())
+            start = time.perf_counter()
+            await connection.execute(query)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    engine = create_async_engine(
+        settings.REAL_DATABASE_URL,
+        future=True,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        connect_args={"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE},
+    )
+    try:
+        for label, build_query in (("literal", literal_query), ("bound", bound_query)):
+            timings = await bench(engine, build_query, iterations)
+            timings.sort()
+            print(
+                f"{label:>8}: median {statistics.median(timings) * 1e6:.0f} us, "
+                f"p99 {timings[int(len(timings) * 0.99) - 1] * 1e6:.0f} us over {iterations} queries"
+            )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,50 @@
+"""Cold vs format-backed article renders.
+
+Run from the PythonCode directory: python benchmarks/bench_render.py [renders]
+"""
+import os
+import resource
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rendering import ARTICLE_FIELDS, ensure_article_format, render_article_pdf  # noqa: E402
+
+SAMPLE_FIELDS = {name: f'Пример текста для поля {name}. Sample text for {name}.' for name in ARTICLE_FIELDS}
+
+
+def _children_cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def bench(use_format: bool, renders: int):
+    wall, cpu = [], []
+    for _ in range(renders):
+        cpu_start = _children_cpu()
+        start = time.perf_counter()
+        render_article_pdf(SAMPLE_FIELDS, use_format=use_format)
+        wall.append(time.perf_counter() - start)
+        cpu.append(_children_cpu() - cpu_start)
+    return wall, cpu
+
+
+def main():
+    renders = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    start = time.perf_counter()
+    if ensure_article_format() is None:
+        sys.exit("Could not build the preamble format (is mylatexformat installed?)")
+    print(f"format build: {time.perf_counter() - start:.3f}s")
+    for label, use_format in (("cold", False), ("format", True)):
+        wall, cpu = bench(use_format, renders)
+        print(
+            f"{label:>6}: wall median {statistics.median(wall) * 1000:.0f} ms, "
+            f"mean {statistics.mean(wall) * 1000:.0f} ms, "
+            f"pdflatex cpu mean {statistics.mean(cpu) * 1000:.0f} ms over {renders} renders"
+        )
+
+
+if __name__ == "__main__":
+    main()
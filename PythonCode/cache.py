@@ -0,0 +1,88 @@
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+import settings
+
+
+class TTLCache:
+    # In-process LRU whose entries also expire after ttl seconds. Only touched
+    # from the event loop thread, so it needs no locking.
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key):
+        self._data.pop(key, None)
+
+    def invalidate_where(self, predicate):
+        for key in [key for key, (_, value) in self._data.items() if predicate(value)]:
+            del self._data[key]
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._data),
+            "max_entries": self.maxsize,
+            "ttl_seconds": self.ttl,
+        }
+
+
+# Authenticated users keyed by token subject (email).
+auth_user_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_ENTRIES, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+
+
+# Current token version per user id, None for deactivated users.
+token_version_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_ENTRIES, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def invalidate_auth_user(user_id: UUID):
+    auth_user_cache.invalidate_where(lambda user: str(user.user_id) == str(user_id))
+    token_version_cache.pop(str(user_id))
+
+
+EVENTS_RESPONSES = "events"
+ARTICLES_RESPONSES = "articles"
+
+# Encoded list responses keyed by (scope, *query params), stored as (scope, etag, body).
+response_cache = TTLCache(maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+_response_generations = {}
+
+
+def response_generation(scope: str) -> int:
+    return _response_generations.get(scope, 0)
+
+
+def invalidate_responses(scope: str):
+    # Bumping the generation also stops a read that started before the write
+    # from caching the rows it loaded.
+    _response_generations[scope] = response_generation(scope) + 1
+    response_cache.invalidate_where(lambda entry: entry[0] == scope)
@@ -1,23 +1,69 @@
-import pathlib
+import hashlib
+from datetime import timedelta
 import sys
-from typing import Union, Coroutine, Any
+from typing import Union, Coroutine, Any, Optional
 import io
 
 import psycopg2
 from fastapi import HTTPException
 from pydantic import EmailStr
-from pylatex import Document, Section, Subsection, Math, Tabular, Center, Package, Command, NewLine, Subsubsection
-from pylatex.utils import italic, NoEscape
-from sqlalchemy import update, and_, select
+from sqlalchemy import update, and_, or_, select, func, delete, literal, literal_column, cast, tuple_, Text, REAL
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.dialects.postgresql import UUID, BYTEA
-from db.models import User, PortalRole, Event, Application, Comments, Notifications, Article
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.dialects.postgresql import UUID, BYTEA, ARRAY
+import settings
+from cache import invalidate_auth_user, invalidate_responses, ARTICLES_RESPONSES, EVENTS_RESPONSES
+from db.session import run_after_commit
+from notification_broker import notification_broker, notification_payload
+from db.models import User, PortalRole, Event, Application, Comments, Notifications, Article, ArticleRenderStatus, \
+    ArticleBlob
+
+
+RUSSIAN = literal_column("'russian'::regconfig")
+ENGLISH = literal_column("'english'::regconfig")
+
+
+def article_search_vector(
+        article_name: str, engl_article_name: str, keywords: str, engl_keywords: str, annotation: str,
+        engl_annotation: str
+):
+    # Names rank above keywords, keywords above annotations. The 0007 migration
+    # backfills existing rows with the same expression.
+    weighted = [
+        (RUSSIAN, article_name, "A"), (ENGLISH, engl_article_name, "A"),
+        (RUSSIAN, keywords, "B"), (ENGLISH, engl_keywords, "B"),
+        (RUSSIAN, annotation, "C"), (ENGLISH, engl_annotation, "C"),
+    ]
+    vector = None
+    for config, text, weight in weighted:
+        part = func.setweight(func.to_tsvector(config, text), literal_column(f"'{weight}'"))
+        vector = part if vector is None else vector.op("||")(part)
+    return vector
+
+
+def article_search_query(query: str):
+    # Matches words stemmed by either configuration; websearch syntax never raises on user input.
+    return func.websearch_to_tsquery(RUSSIAN, query).op("||")(func.websearch_to_tsquery(ENGLISH, query))
 
 
 class UserDAL:
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
 
+    async def _invalidate_auth_user(self, user_id: UUID):
+        # Again after commit, so a request racing this transaction cannot re-cache the old row.
+        invalidate_auth_user(user_id)
+        run_after_commit(self.db_session, lambda: invalidate_auth_user(user_id))
+        if settings.NOTIFICATIONS_BROKER == "postgres":
+            await self.db_session.execute(select(func.pg_notify(settings.AUTH_CACHE_CHANNEL, str(user_id))))
+
+    async def _invalidate_responses(self, scope: str):
+        invalidate_responses(scope)
+        run_after_commit(self.db_session, lambda: invalidate_responses(scope))
+        if settings.NOTIFICATIONS_BROKER == "postgres":
+            # Delivered to every worker, this one included, when the transaction commits.
+            await self.db_session.execute(select(func.pg_notify(settings.RESPONSE_CACHE_CHANNEL, scope)))
+
     async def create_user(
             self, name: str, surname: str, email: str, age: int, hashed_password: str, roles: str,
     ) -> User:
@@ -33,91 +79,28 @@ class UserDAL:
         await self.db_session.flush()
         return new_user
 
+    async def create_users(self, users: list[dict]) -> list:
+        # Multi-row INSERTs that skip taken emails; only the rows actually inserted come back.
+        created = []
+        batch_size = settings.BULK_INSERT_BATCH_SIZE
+        for start in range(0, len(users), batch_size):
+            query = insert(User).values(users[start:start + batch_size]).on_conflict_do_nothing(
+                index_elements=[User.email]
+            ).returning(User.user_id, User.email)
+            res = await self.db_session.execute(query)
+            created.extend(res.all())
+        return created
+
     async def create_article(
             self, user_id: str, article_name: str, engl_article_name: str, authors: str, engl_authors: str,
             author_city_first: str, author_city_second: str, engl_author_city_first: str, engl_author_city_second: str,
             annotation: str, keywords: str, engl_annotation: str, engl_keywords: str, introduction: str, theory: str,
-            results: str, conclusion: str, thanks: str, list_of_sources: str
+            results: str, conclusion: str, thanks: str, list_of_sources: str, doc_article: Optional[bytes],
+            render_status: str = ArticleRenderStatus.DONE
     ) -> Article:
-        annotation1 = 'Аннотация. ' + annotation
-        keywords1 = 'Ключевые слова: ' + keywords
-        engl_annotation1 = 'Abstract. ' + engl_annotation
-        engl_keywords1 = 'Keywords: ' + engl_keywords
-        margins = {'tmargin': '20mm', 'lmargin': '25mm', 'rmargin': '25mm', 'bmargin': '20mm'}
-        doc = Document(documentclass='article', document_options=None, fontenc=['T2A', 'T1'], lmodern=None,
-                       textcomp=None, page_numbers=None, indent=True, font_size='normalsize', data=None,
-                       geometry_options=margins)
-        doc.packages.add(Package('babel', options=['english', 'russian']))
-        doc.packages.add(Package('newtxtext, newtxmath'))
-        doc.packages.add(Package('substitutefont'))
-        doc.preamble.append(NoEscape(r'\substitutefont{T2A}{/familydefault}{Tempora-TLF}'))
-        doc.packages.add(Package('lastpage'))
-        doc.packages.add(Package('indentfirst'))
-        doc.preamble.append(Command(r'linespread', arguments='1.5'))
-        doc.preamble.append(NoEscape(r'\setlength{\parindent}{5ex}'))
-        doc.preamble.append(NoEscape(r'\setlength{\parskip}{1ex}'))
-        doc.append(NoEscape(r'\pretolerance=10000'))
-        doc.append(NoEscape(r'\fontsize{12}{12pt}\selectfont'))
-
-        with doc.create(Center()) as center:
-            with center.create(Section(article_name, numbering=False)):
-                pass
-            with center.create(Section(engl_article_name, numbering=False)):
-                pass
-            with center.create(Subsection(authors, numbering=False)):
-                pass
-            with center.create(Subsection(author_city_first, numbering=False)):
-                pass
-            with center.create(Subsection(author_city_second, numbering=False)):
-                pass
-            with center.create(Subsection(engl_authors, numbering=False)):
-                pass
-            with center.create(Subsection(engl_author_city_first, numbering=False)):
-                pass
-            with center.create(Subsection(engl_author_city_second, numbering=False)):
-                pass
-
-        doc.append(NoEscape(r'\par'))
-        doc.append(annotation1)
-        doc.append(NewLine())
-        doc.append(NoEscape(r'\par'))
-        doc.append(keywords1)
-        doc.append(NewLine())
-        doc.append(NoEscape(r'\par'))
-        doc.append(engl_annotation1)
-        doc.append(NewLine())
-        doc.append(NoEscape(r'\par'))
-        doc.append(engl_keywords1)
-        doc.append(NewLine())
-
-        with doc.create(Subsection('Введение', numbering=False)):
-            # doc.append(Command('centering'))
-            doc.append(introduction)
-
-        with doc.create(Subsection('Теория', numbering=False)):
-            pass
-        doc.append(theory)
-        with doc.create(Subsection('Результаты', numbering=False)):
-            pass
-        doc.append(results)
-        with doc.create(Subsection('Выводы и заключение', numbering=False)):
-            pass
-        doc.append(conclusion)
-        with doc.create(Subsection('Источник финансирования. Благодарности', numbering=False)):
-            pass
-        doc.append(thanks)
-        with doc.create(Subsection('Список источников', numbering=False)):
-            pass
-        doc.append(list_of_sources)
-        doc.generate_pdf('images_article/image', clean_tex=False, compiler='pdflatex')
-        pdf_path = pathlib.Path("images_article/image.pdf")
-
-        doc_article = pdf_path.read_bytes()
-
-        # f = open("images_article/image.pdf", 'rb')
-        # dat = f.read()
-        # binary = psycopg2.Binary(dat)
-
+        doc_sha256 = None
+        if doc_article is not None:
+            doc_sha256 = await self.store_article_blob(doc_article)
         new_article = Article(
             user_id=user_id,
             article_name=article_name,
@@ -138,12 +121,95 @@ class UserDAL:
             conclusion=conclusion,
             thanks=thanks,
             list_of_sources=list_of_sources,
-            doc_article=doc_article
+            doc_sha256=doc_sha256,
+            render_status=render_status,
+            render_queued_at=func.now() if render_status == ArticleRenderStatus.QUEUED else None,
+            search_vector=article_search_vector(
+                article_name, engl_article_name, keywords, engl_keywords, annotation, engl_annotation
+            ),
         )
         self.db_session.add(new_article)
         await self.db_session.flush()
+        await self._invalidate_responses(ARTICLES_RESPONSES)
         return new_article
 
+    async def update_article_render_status(
+            self, article_id: UUID, render_status: str, doc_article: Optional[bytes] = None,
+            render_error: Optional[str] = None
+    ):
+        values = {"render_status": render_status, "render_error": render_error}
+        if doc_article is not None:
+            values["doc_sha256"] = await self.store_article_blob(doc_article)
+        query = update(Article).where(Article.article_id == article_id).values(**values)
+        await self.db_session.execute(query)
+        await self._invalidate_responses(ARTICLES_RESPONSES)
+
+    async def store_article_blob(self, data: bytes) -> str:
+        # Blobs are addressed by content, so a resubmitted article reuses the stored PDF.
+        sha256 = hashlib.sha256(data).hexdigest()
+        query = insert(ArticleBlob).values(sha256=sha256, size=len(data), data=data).on_conflict_do_nothing(
+            index_elements=[ArticleBlob.sha256])
+        await self.db_session.execute(query)
+        return sha256
+
+    async def count_article_render_jobs(self) -> int:
+        query = select(func.count()).select_from(Article).where(
+            Article.render_status.in_([ArticleRenderStatus.QUEUED, ArticleRenderStatus.RENDERING])
+        )
+        res = await self.db_session.execute(query)
+        return res.scalar()
+
+    async def claim_article_render_job(self, fields: tuple):
+        # Oldest queued job first. SKIP LOCKED lets every worker process claim
+        # concurrently without ever handing the same job to two of them.
+        candidate = select(Article.article_id).where(
+            Article.render_status == ArticleRenderStatus.QUEUED
+        ).order_by(Article.render_queued_at).limit(1).with_for_update(skip_locked=True).scalar_subquery()
+        query = update(Article).where(Article.article_id == candidate).values(
+            render_status=ArticleRenderStatus.RENDERING,
+            render_started_at=func.now(),
+            render_attempts=Article.render_attempts + 1,
+        ).returning(Article.article_id, *[Article.__table__.c[field] for field in fields])
+        res = await self.db_session.execute(query)
+        job = res.fetchone()
+        if job is not None:
+            await self._invalidate_responses(ARTICLES_RESPONSES)
+        return job
+
+    async def release_article_render_jobs(self, article_ids: list):
+        # Hands claimed jobs back to the queue without counting the attempt.
+        query = update(Article).where(
+            Article.article_id.in_(article_ids), Article.render_status == ArticleRenderStatus.RENDERING
+        ).values(render_status=ArticleRenderStatus.QUEUED, render_attempts=Article.render_attempts - 1)
+        await self.db_session.execute(query)
+        await self._invalidate_responses(ARTICLES_RESPONSES)
+
+    async def requeue_stale_article_render_jobs(self, stale_seconds: float, max_attempts: int) -> int:
+        # A job still rendering after stale_seconds belonged to a worker that died.
+        # It goes back to the queue, or fails once it has used up its attempts.
+        stale = and_(
+            Article.render_status == ArticleRenderStatus.RENDERING,
+            Article.render_started_at < func.now() - timedelta(seconds=stale_seconds),
+        )
+        failed = await self.db_session.execute(
+            update(Article).where(stale, Article.render_attempts >= max_attempts).values(
+                render_status=ArticleRenderStatus.FAILED,
+                render_error=f"Render did not finish after {max_attempts} attempts",
+            )
+        )
+        requeued = await self.db_session.execute(
+            update(Article).where(stale).values(render_status=ArticleRenderStatus.QUEUED)
+        )
+        if failed.rowcount or requeued.rowcount:
+            await self._invalidate_responses(ARTICLES_RESPONSES)
+        return requeued.rowcount
+
+    async def get_article_render_status(self, article_id: UUID):
+        query = select(Article.article_id, Article.render_status, Article.render_error).where(
+            Article.article_id == article_id)
+        res = await self.db_session.execute(query)
+        return res.fetchone()
+
     async def create_manager(
             self, name: str, surname: str, email: str, hashed_password: str, roles: str
     ) -> User:
@@ -196,8 +262,40 @@ class UserDAL:
         )
         self.db_session.add(new_notification)
         await self.db_session.flush()
+        await self._publish_notifications([notification_payload(new_notification)])
         return new_notification
 
+    async def create_notifications(self, notifications: list[dict]) -> int:
+        # Multi-row INSERTs of BULK_INSERT_BATCH_SIZE rows, one round trip per batch.
+        created = 0
+        batch_size = settings.BULK_INSERT_BATCH_SIZE
+        for start in range(0, len(notifications), batch_size):
+            query = insert(Notifications).values(notifications[start:start + batch_size]).returning(
+                Notifications.__table__
+            )
+            res = await self.db_session.execute(query)
+            rows = res.all()
+            await self._publish_notifications([notification_payload(row) for row in rows])
+            created += len(rows)
+        return created
+
+    async def _publish_notifications(self, payloads: list[str]):
+        # Either way subscribers only hear about notifications once they are committed.
+        if not payloads:
+            return
+        if settings.NOTIFICATIONS_BROKER == "postgres":
+            # NOTIFY is transactional, Postgres delivers it at commit and drops it on rollback.
+            query = select(func.pg_notify(
+                settings.NOTIFICATIONS_CHANNEL, func.unnest(literal(payloads, ARRAY(Text)))
+            ))
+            await self.db_session.execute(query)
+        else:
+            def publish():
+                for payload in payloads:
+                    notification_broker.publish(payload)
+
+            run_after_commit(self.db_session, publish)
+
     async def create_event(
             self, name: str, content: str, date: str
     ) -> Event:
@@ -208,11 +306,13 @@ class UserDAL:
         )
         self.db_session.add(new_event)
         await self.db_session.flush()
+        await self._invalidate_responses(EVENTS_RESPONSES)
         return new_event
 
     async def delete_user(self, user_id: UUID) -> Union[User, None]:
+        await self._invalidate_auth_user(user_id)
         query = update(User).where(and_(User.user_id == user_id, User.is_active == True)).values(
-            is_active=False).returning(User.user_id)
+            is_active=False, token_version=User.token_version + 1).returning(User.user_id)
         res = await self.db_session.execute(query)
         deleted_user_id_row = res.fetchone()
         if deleted_user_id_row is not None:
@@ -221,6 +321,7 @@ class UserDAL:
     async def delete_event(self, event_id: UUID) -> Union[Event, None]:
         query = update(Event).where(and_(Event.event_id == event_id, Event.is_active == True)).values(
             is_active=False).returning(Event.event_id)
+        await self._invalidate_responses(EVENTS_RESPONSES)
         res = await self.db_session.execute(query)
         deleted_event_id_row = res.fetchone()
         if deleted_event_id_row is not None:
@@ -241,74 +342,116 @@ class UserDAL:
             return event_row[0]
 
     async def get_comment_by_application_id(self, application_id: UUID) -> list[Comments]:
-        query = f"""SELECT * FROM comments where application_id::text = '{application_id}'"""
+        query = select(Comments.__table__).where(Comments.application_id == str(application_id))
         res = await self.db_session.execute(query)
         comment_row = list(res.fetchall())
         if comment_row is not None:
             return comment_row
 
     async def get_application_by_user_id(self, user_id: UUID) -> list[Application]:
-        query = f"""SELECT * FROM applications where user_id::text = '{user_id}'"""
+        query = select(Application.__table__).where(Application.user_id == user_id)
         res = await self.db_session.execute(query)
         application_row = list(res.fetchall())
         if application_row is not None:
             return application_row
 
     async def get_application_by_application_id(self, application_id: UUID) -> list[Application]:
-        query = f"""SELECT * FROM applications where id::text = '{application_id}'"""
+        query = select(Application.__table__).where(Application.id == application_id)
         res = await self.db_session.execute(query)
         application_row = list(res.fetchall())
         if application_row is not None:
             return application_row
 
-    async def get_article_by_user_id(self, user_id: UUID) -> list[Article]:
-        query = f"""SELECT article_id, user_id,article_name,engl_article_name,authors,engl_authors,author_city_first,author_city_second,engl_author_city_first,engl_author_city_second,annotation,keywords,engl_annotation,engl_keywords,introduction,theory,results,conclusion,thanks,list_of_sources FROM article where user_id::text = '{user_id}'"""
+    async def get_article_by_user_id(self, user_id: UUID, fields: list) -> list[Article]:
+        query = select(*[Article.__table__.c[field] for field in fields]).where(Article.user_id == user_id)
         res = await self.db_session.execute(query)
         article_row = list(res.fetchall())
         if article_row is not None:
             return article_row
 
-    async def get_article_by_article_id(self, article_id: UUID) -> list[Article]:
-        query = f"""SELECT article_id, user_id,article_name,engl_article_name,authors,engl_authors,author_city_first,author_city_second,engl_author_city_first,engl_author_city_second,annotation,keywords,engl_annotation,engl_keywords,introduction,theory,results,conclusion,thanks,list_of_sources FROM article where article_id::text = '{article_id}'"""
+    async def get_article_by_article_id(self, article_id: UUID, fields: list) -> list[Article]:
+        query = select(*[Article.__table__.c[field] for field in fields]).where(Article.article_id == article_id)
         res = await self.db_session.execute(query)
         article_row = list(res.fetchall())
         if article_row is not None:
             return article_row
 
-    async def get_old_applications(self) -> list[Application]:
-        query = f"""SELECT * FROM applications where status != 'Заявка не осмотрена'"""
+    async def _get_page(self, query, key_column, limit: int, after=None) -> list:
+        # Keyset pagination: seek past the last key of the previous page instead
+        # of OFFSET, so every page costs the same however deep the client is.
+        # Rows come back as (key, item), item being the row already encoded as
+        # JSON text by Postgres, so the API only has to join them.
+        if after is not None:
+            query = query.where(key_column > after)
+        page = query.order_by(key_column).limit(limit).subquery("page")
+        json_query = select(
+            page.c[key_column.name].label("key"),
+            cast(func.row_to_json(literal_column("page")), Text).label("item"),
+        ).order_by(page.c[key_column.name])
+        res = await self.db_session.execute(json_query)
+        return list(res.fetchall())
+
+    async def get_old_applications(self, limit: int, after: Optional[UUID] = None) -> list:
+        query = select(Application.__table__).where(Application.status != 'Заявка не осмотрена')
+        return await self._get_page(query, Application.id, limit, after)
+
+    async def get_articles(self, limit: int, fields: list, after: Optional[UUID] = None) -> list:
+        query = select(*[Article.__table__.c[field] for field in fields])
+        return await self._get_page(query, Article.article_id, limit, after)
+
+    async def search_articles(
+            self, query: str, limit: int, fields: list, after: Optional[tuple] = None
+    ) -> list:
+        # Best ranked first. The GIN index finds the matches, only those are ranked.
+        # The cursor is "<rank>:<article_id>" of the last row, Postgres prints real
+        # values exactly, so they compare equal when cast back.
+        ts_query = article_search_query(query)
+        rank = func.ts_rank_cd(Article.search_vector, ts_query)
+        page = select(*[Article.__table__.c[field] for field in fields], rank.label("rank")).where(
+            Article.search_vector.op("@@")(ts_query)
+        )
+        if after is not None:
+            after_rank, after_id = after
+            page = page.where(tuple_(rank, Article.article_id) < tuple_(cast(after_rank, REAL), after_id))
+        page = page.order_by(rank.desc(), Article.article_id.desc()).limit(limit).subquery("page")
+        json_query = select(
+            func.concat(cast(page.c.rank, Text), ":", cast(page.c.article_id, Text)).label("key"),
+            cast(func.row_to_json(literal_column("page")), Text).label("item"),
+        ).order_by(page.c.rank.desc(), page.c.article_id.desc())
+        res = await self.db_session.execute(json_query)
+        return list(res.fetchall())
+
+    async def get_doc_article_meta(self, article_id: UUID):
+        query = select(ArticleBlob.size, ArticleBlob.sha256).join(
+            Article, Article.doc_sha256 == ArticleBlob.sha256).where(Article.article_id == article_id)
         res = await self.db_session.execute(query)
-        application_row = list(res.fetchall())
-        if application_row is not None:
-            return application_row
+        return res.fetchone()
 
-    async def get_articles(self) -> list[Article]:
-        query = f"""SELECT article_id, user_id,article_name,engl_article_name,authors,engl_authors,author_city_first,author_city_second,engl_author_city_first,engl_author_city_second,annotation,keywords,engl_annotation,engl_keywords,introduction,theory,results,conclusion,thanks,list_of_sources FROM article"""
+    async def get_doc_article_chunk(self, sha256: str, offset: int, length: int) -> bytes:
+        query = select(func.substr(ArticleBlob.data, offset + 1, length)).where(ArticleBlob.sha256 == sha256)
         res = await self.db_session.execute(query)
-        article_row = list(res.fetchall())
-        if article_row is not None:
-            return article_row
+        return res.scalar()
 
-    async def get_doc_articles(self, article_id) -> bytes:
-        query = f"""SELECT doc_article FROM article WHERE article_id::text = '{article_id}'"""
-        res = await self.db_session.execute(query)
-        article_row = res.fetchone()
-        if article_row is not None:
-            return article_row[0]
+    async def get_new_applications(self, limit: int, after: Optional[UUID] = None) -> list:
+        query = select(Application.__table__).where(Application.status == 'Заявка не осмотрена')
+        return await self._get_page(query, Application.id, limit, after)
 
-    async def get_new_applications(self) -> list[Application]:
-        query = f"""SELECT * FROM applications where status = 'Заявка не осмотрена'"""
+    async def get_notification_by_user_id(
+            self, user_id: UUID, limit: int, after: Optional[UUID] = None
+    ) -> list:
+        query = select(Notifications.__table__).where(
+            and_(Notifications.user_id == str(user_id), Notifications.status == True))
+        return await self._get_page(query, Notifications.id, limit, after)
+
+    async def get_notification(self, notification_id: UUID):
+        query = select(Notifications.__table__).where(Notifications.id == notification_id)
         res = await self.db_session.execute(query)
-        application_row = list(res.fetchall())
-        if application_row is not None:
-            return application_row
+        return res.fetchone()
 
-    async def get_notification_by_user_id(self, user_id: UUID) -> list[Notifications]:
-        query = f"""SELECT * FROM notifications where user_id::text = '{user_id}' and status='true'"""
+    async def get_token_version(self, user_id: UUID):
+        query = select(User.token_version, User.is_active).where(User.user_id == user_id)
         res = await self.db_session.execute(query)
-        notification_row = list(res.fetchall())
-        if notification_row is not None:
-            return notification_row
+        return res.fetchone()
 
     async def get_user_by_email(self, email: str) -> Union[User, None]:
         query = select(User).where(and_(User.email == email))
@@ -323,8 +466,17 @@ class UserDAL:
                 status_code=418,
                 detail="I'm a teapot",
             )
-        sql_update_query = f"""Update users set name = '{name}', surname = '{surname}', email = '{email}' where user_id::text = '{user_id}'"""
-        await self.db_session.execute(sql_update_query, (name, surname, email, str(user_id)))
+        await self._invalidate_auth_user(user_id)
+        query = update(User).where(User.user_id == user_id).values(name=name, surname=surname, email=email)
+        await self.db_session.execute(query)
+
+    async def update_password_hash(self, user_id: UUID, old_hashed_password: str, hashed_password: str):
+        # Only replaces the hash that was verified, a password changed in the meantime wins.
+        await self._invalidate_auth_user(user_id)
+        query = update(User).where(
+            User.user_id == user_id, User.hashed_password == old_hashed_password
+        ).values(hashed_password=hashed_password)
+        await self.db_session.execute(query)
 
     async def update_event(self, name: str, content: str, event_id: UUID):
         if content is None or name is None:
@@ -332,18 +484,18 @@ class UserDAL:
                 status_code=418,
                 detail="I'm a teapot",
             )
-        sql_update_query = f"""Update events set name = '{name}', content = '{content}' where event_id::text = '{event_id}'"""
-        await self.db_session.execute(sql_update_query, (name, content, str(event_id)))
+        await self._invalidate_responses(EVENTS_RESPONSES)
+        query = update(Event).where(Event.event_id == event_id).values(name=name, content=content)
+        await self.db_session.execute(query)
 
     async def update_notifications(self, user_id: UUID):
-        a = 'aaa'
-        sql_update_query = f"""Update notifications set status = 'false' where id::text = '{user_id}'"""
-        await self.db_session.execute(sql_update_query, (a, str(user_id)))
+        # Despite the name, this marks a single notification (by its id) as read.
+        query = update(Notifications).where(Notifications.id == user_id).values(status=False)
+        await self.db_session.execute(query)
 
     async def delete_notifications(self, user_id: UUID):
-        a = 'aaa'
-        sql_update_query = f"""Delete from notifications where user_id::text = '{user_id}'"""
-        await self.db_session.execute(sql_update_query, (a, str(user_id)))
+        query = delete(Notifications).where(Notifications.user_id == str(user_id))
+        await self.db_session.execute(query)
 
     async def update_appplication(self, id: UUID, status: str):
         if status is None:
@@ -351,34 +503,57 @@ class UserDAL:
                 status_code=418,
                 detail="I'm a teapot",
             )
-        sql_update_query = f"""Update applications set status = '{status}' where id::text = '{id}'"""
-        await self.db_session.execute(sql_update_query, (status, str(id)))
+        query = update(Application).where(Application.id == id).values(status=status)
+        await self.db_session.execute(query)
+
+    async def update_applications_status(self, changes: list[tuple[UUID, str]]) -> list:
+        # One UPDATE joined against the unnested id and status arrays, two bind
+        # parameters however many applications change.
+        ids, statuses = zip(*changes) if changes else ((), ())
+        updates = func.unnest(
+            literal(list(ids), ARRAY(UUID(as_uuid=True))), literal(list(statuses), ARRAY(Text))
+        ).table_valued("id", "status").render_derived(name="changes")
+        query = update(Application).where(Application.id == updates.c.id).values(
+            status=updates.c.status
+        ).returning(Application.id, Application.user_id, Application.application_name, Application.status)
+        res = await self.db_session.execute(query)
+        return res.all()
+
+    async def _set_roles(self, user_id: UUID, roles: str):
+        await self._invalidate_auth_user(user_id)
+        query = update(User).where(User.user_id == user_id).values(
+            roles=roles, token_version=User.token_version + 1)
+        await self.db_session.execute(query)
 
     async def grant_admin_roles(self, user_id: UUID):
-        a = 'aaa'
-        sql_update_query = f"""Update users set roles = 'ROLE_PORTAL_ADMIN' where user_id::text = '{user_id}'"""
-        await self.db_session.execute(sql_update_query, (str(user_id), a))
+        await self._set_roles(user_id, PortalRole.ROLE_PORTAL_ADMIN)
 
     async def revoke_admin_roles(self, user_id: UUID):
-        a = 'aaa'
-        sql_update_query = f"""Update users set roles = 'ROLE_PORTAL_USER' where user_id::text = '{user_id}'"""
-        await self.db_session.execute(sql_update_query, (str(user_id), a))
+        await self._set_roles(user_id, PortalRole.ROLE_PORTAL_USER)
 
     async def grant_manager_roles(self, user_id: UUID):
-        a = 'aaa'
-        sql_update_query = f"""Update users set roles = 'ROLE_PORTAL_MANAGER' where user_id::text = '{user_id}'"""
-        await self.db_session.execute(sql_update_query, (str(user_id), a))
-
-    async def get_all_users(self) -> list[User]:
-        query = f"""SELECT * FROM users where roles = 'ROLE_PORTAL_MANAGER' AND is_active = true"""
+        await self._set_roles(user_id, PortalRole.ROLE_PORTAL_MANAGER)
+
+    async def search_users(self, term: str, limit: int) -> list:
+        # Substring matches for typeahead plus trigram similarity to tolerate typos,
+        # most similar first. Every branch is answered by a pg_trgm GIN index.
+        pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        columns = (User.name, User.surname, User.email)
+        matches = [column.ilike(pattern, escape="\\") for column in columns]
+        matches += [column.op("%")(term) for column in columns]
+        similarity = func.greatest(*[func.similarity(column, term) for column in columns])
+        query = select(User.user_id, User.name, User.surname, User.email, User.roles).where(
+            and_(User.is_active == True, or_(*matches))
+        ).order_by(similarity.desc(), User.user_id).limit(limit)
         res = await self.db_session.execute(query)
-        user_row = list(res.fetchall())
-        if user_row is not None:
-            return user_row
+        return list(res.fetchall())
 
-    async def get_all_events(self) -> list[Event]:
-        query = f"""SELECT * FROM events where is_active = true"""
-        res = await self.db_session.execute(query)
-        event_row = list(res.fetchall())
-        if event_row is not None:
-            return event_row
+    async def get_all_users(self, limit: int, after: Optional[UUID] = None) -> list:
+        # The ShowUser columns only, the rows go to the client as they are.
+        query = select(User.user_id, User.name, User.surname, User.age, User.email, User.is_active).where(
+            and_(User.roles == PortalRole.ROLE_PORTAL_MANAGER, User.is_active == True))
+        return await self._get_page(query, User.user_id, limit, after)
+
+    async def get_all_events(self, limit: int, after: Optional[UUID] = None) -> list:
+        query = select(Event.__table__).where(Event.is_active == True)
+        return await self._get_page(query, Event.event_id, limit, after)
@@ -3,8 +3,8 @@ from datetime import datetime
 from enum import Enum
 from sqlite3 import Binary
 
-from sqlalchemy import Column, String, Boolean, ForeignKey, Integer
-from sqlalchemy.dialects.postgresql import UUID, BYTEA
+from sqlalchemy import Column, String, Boolean, ForeignKey, Integer, Index, DateTime, text
+from sqlalchemy.dialects.postgresql import UUID, BYTEA, TSVECTOR
 from sqlalchemy.orm import declarative_base, relationship
 
 
@@ -21,8 +21,21 @@ class PortalRole(str, Enum):
     ROLE_PORTAL_MANAGER = "ROLE_PORTAL_MANAGER"
 
 
+class ArticleRenderStatus(str, Enum):
+    QUEUED = "queued"
+    RENDERING = "rendering"
+    DONE = "done"
+    FAILED = "failed"
+
+
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Trigram indexes serve both the ILIKE and the similarity (%) matches of UserDAL.search_users.
+        Index("ix_users_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_users_surname_trgm", "surname", postgresql_using="gin", postgresql_ops={"surname": "gin_trgm_ops"}),
+        Index("ix_users_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+    )
 
     user_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
@@ -32,13 +45,23 @@ class User(Base):
     is_active = Column(Boolean(), default=True)
     hashed_password = Column(String, nullable=False)
     roles = Column(String, nullable=False)
+    # Bumped on every role change or deactivation, which revokes tokens issued before it.
+    token_version = Column(Integer, nullable=False, default=0)
 
 
 class Article(Base):
     __tablename__ = "article"
+    __table_args__ = (
+        Index("ix_article_search_vector", "search_vector", postgresql_using="gin"),
+        # Only unfinished render jobs, in the order the render workers claim them.
+        Index(
+            "ix_article_render_queue", "render_status", "render_queued_at",
+            postgresql_where=text("render_status IN ('queued', 'rendering')"),
+        ),
+    )
 
     article_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True))
+    user_id = Column(UUID(as_uuid=True), index=True)
     article_name = Column(String, nullable=False)
     engl_article_name = Column(String, nullable=False)
     authors = Column(String, nullable=False)
@@ -57,7 +80,22 @@ class Article(Base):
     conclusion = Column(String, nullable=False)
     thanks = Column(String, nullable=False)
     list_of_sources = Column(String, nullable=False)
-    doc_article = Column(BYTEA, nullable=False)
+    doc_sha256 = Column(String, ForeignKey("article_blobs.sha256"), nullable=True)
+    render_status = Column(String, nullable=False, default=ArticleRenderStatus.DONE)
+    render_error = Column(String, nullable=True)
+    render_queued_at = Column(DateTime(timezone=True), nullable=True)
+    render_started_at = Column(DateTime(timezone=True), nullable=True)
+    render_attempts = Column(Integer, nullable=False, default=0)
+    # Russian and English lexemes of the names, keywords and annotations, set by UserDAL.create_article.
+    search_vector = Column(TSVECTOR, nullable=True)
+
+
+class ArticleBlob(Base):
+    __tablename__ = "article_blobs"
+
+    sha256 = Column(String, primary_key=True)
+    size = Column(Integer, nullable=False)
+    data = Column(BYTEA, nullable=False)
 
 
 class Event(Base):
@@ -75,7 +113,7 @@ class Application(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     event_id = Column(UUID(as_uuid=True))
-    user_id = Column(UUID(as_uuid=True))
+    user_id = Column(UUID(as_uuid=True), index=True)
     event_name = Column(String, nullable=False)
     application_name = Column(String, nullable=False)
     content = Column(String, nullable=False)
@@ -88,7 +126,7 @@ class Comments(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     manager_id = Column(UUID)
-    application_id = Column(UUID,  nullable=True)
+    application_id = Column(UUID,  nullable=True, index=True)
     manager_name = Column(String, nullable=False)
     manager_surname = Column(String, nullable=False)
     content = Column(String, nullable=False)
@@ -97,6 +135,10 @@ class Comments(Base):
 
 class Notifications(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Serves the per-user unread lookup including its keyset ordering on id.
+        Index("ix_notifications_user_id_status", "user_id", "status", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     application_name = Column(String, nullable=False)
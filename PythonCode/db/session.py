@@ -1,19 +1,94 @@
+import itertools
 from typing import Generator
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
+from sqlalchemy.orm import sessionmaker, Session
+from starlette.requests import Request
 
 
 import settings
 
+READ_ONLY_METHODS = ("GET", "HEAD")
 
-engine = create_async_engine(settings.REAL_DATABASE_URL, future=True, echo=True)
+
+def create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        future=True,
+        echo=settings.DB_ECHO,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        connect_args={
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            "command_timeout": settings.DB_COMMAND_TIMEOUT,
+        },
+    )
+
+
+engine = create_engine(settings.REAL_DATABASE_URL)
 async_session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
+replica_engines = [create_engine(url) for url in settings.REPLICA_DATABASE_URLS]
+replica_sessions = [
+    sessionmaker(replica_engine, expire_on_commit=False, class_=AsyncSession) for replica_engine in replica_engines
+]
+_replica_session_cycle = itertools.cycle(replica_sessions)
+
+
+def read_sessionmaker() -> sessionmaker:
+    # Round-robin over the replicas, falling back to the primary when none are configured.
+    if replica_sessions:
+        return next(_replica_session_cycle)
+    return async_session
+
 
-async def get_db() -> Generator:
+def read_session() -> AsyncSession:
+    return read_sessionmaker()()
+
+
+async def get_db(request: Request) -> Generator:
+    # Read-only requests go to a replica, everything else to the primary.
+    if request.method in READ_ONLY_METHODS:
+        session: AsyncSession = read_session()
+    else:
+        session = async_session()
     try:
-        session: AsyncSession = async_session()
         yield session
     finally:
-        await session.close()
\ No newline at end of file
+        await session.close()
+
+
+async def get_primary_db() -> Generator:
+    # For reads that must see the caller's own just-committed writes.
+    session: AsyncSession = async_session()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+def run_after_commit(session: AsyncSession, callback):
+    # Callbacks run once the surrounding transaction commits and are dropped on rollback.
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session):
+    for callback in session.info.pop("after_commit", []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit_callbacks(session: Session):
+    session.info.pop("after_commit", None)
+
+
+async def dispose_engines():
+    await engine.dispose()
+    for replica_engine in replica_engines:
+        await replica_engine.dispose()
@@ -1,6 +1,72 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+import settings
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    # Pinning the bounds makes needs_update() flag hashes of any other cost, lower or higher.
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+
+class HashingPoolBusy(Exception):
+    pass
+
+
+class HashingPool:
+    # bcrypt releases the GIL, so a thread pool spreads hashing over the cores
+    # while the event loop keeps serving other requests.
+    def __init__(self, max_workers: int, max_queue_depth: int):
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._waits = deque(maxlen=1000)
+        self._max_wait = 0.0
+
+    async def run(self, func, *args):
+        if self._pending >= self.max_workers + self.max_queue_depth:
+            self.rejected += 1
+            raise HashingPoolBusy(f"Password hashing is busy ({self._pending} operations in progress or queued)")
+        self._pending += 1
+        submitted = time.perf_counter()
+
+        def timed():
+            return time.perf_counter() - submitted, func(*args)
+
+        try:
+            wait, result = await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self._pending -= 1
+        self.completed += 1
+        self._waits.append(wait)
+        self._max_wait = max(self._max_wait, wait)
+        return result
+
+    def stats(self) -> dict:
+        waits = sorted(self._waits)
+        return {
+            "workers": self.max_workers,
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_p50_ms": waits[len(waits) // 2] * 1000 if waits else 0.0,
+            "wait_p99_ms": waits[int(len(waits) * 0.99)] * 1000 if waits else 0.0,
+            "wait_max_ms": self._max_wait * 1000,
+        }
+
+
+hashing_pool = HashingPool(settings.HASH_POOL_WORKERS, settings.HASH_QUEUE_DEPTH)
 
 
 class Hasher:
@@ -10,4 +76,16 @@ class Hasher:
 
     @staticmethod
     def get_password_hash(password) -> str:
-        return pwd_context.hash(password)
\ No newline at end of file
+        return pwd_context.hash(password)
+
+    @staticmethod
+    def needs_rehash(hashed_password) -> bool:
+        return pwd_context.needs_update(hashed_password)
+
+    @staticmethod
+    async def verify_password_async(plain_password, hashed_password) -> bool:
+        return await hashing_pool.run(pwd_context.verify, plain_password, hashed_password)
+
+    @staticmethod
+    async def get_password_hash_async(password) -> str:
+        return await hashing_pool.run(pwd_context.hash, password)
\ No newline at end of file
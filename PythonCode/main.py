@@ -4,7 +4,13 @@ from starlette.middleware.cors import CORSMiddleware
 from starlette.staticfiles import StaticFiles
 
 from api.handlers import user_router
-from api.login_handler import login_router
+from api.login_handler import login_router, well_known_router
+from api.metrics_handler import metrics_router
+import settings
+from api.actions.render_jobs import article_render_worker
+from db.session import dispose_engines
+from notification_broker import notification_listener
+from rendering import render_pool
 
 app = FastAPI()
 
@@ -22,8 +28,42 @@ main_api_router = APIRouter()
 
 main_api_router.include_router(login_router, prefix="/login", tags=["login"])
 main_api_router.include_router(user_router, prefix="/user", tags=["user"])
+main_api_router.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
+main_api_router.include_router(well_known_router, prefix="/.well-known", tags=["login"])
 app.include_router(main_api_router)
 # app.mount("/static", StaticFiles(directory="get_media"), name="media")
 
+
+@app.on_event("startup")
+async def start_notification_listener():
+    if settings.NOTIFICATIONS_BROKER == "postgres":
+        notification_listener.start()
+
+
+@app.on_event("shutdown")
+async def stop_notification_listener():
+    await notification_listener.stop()
+
+
+@app.on_event("startup")
+async def start_article_render_worker():
+    article_render_worker.start()
+
+
+@app.on_event("shutdown")
+async def stop_article_render_worker():
+    await article_render_worker.stop()
+
+
+@app.on_event("shutdown")
+def shutdown_render_pool():
+    render_pool.shutdown()
+
+
+@app.on_event("shutdown")
+async def shutdown_db_engines():
+    await dispose_engines()
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,115 @@
+"""initial schema
+
+Revision ID: 0001_initial
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0001_initial'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _create_missing_table(existing: set, name: str, *columns):
+    if name not in existing:
+        op.create_table(name, *columns)
+
+
+def upgrade() -> None:
+    # Databases created before migrations existed already have these tables,
+    # so only the missing ones are created and the later revisions apply on top.
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    _create_missing_table(
+        existing,
+        'users',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('surname', sa.String(), nullable=False),
+        sa.Column('age', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False, unique=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('roles', sa.String(), nullable=False),
+    )
+    _create_missing_table(
+        existing,
+        'article',
+        sa.Column('article_id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('article_name', sa.String(), nullable=False),
+        sa.Column('engl_article_name', sa.String(), nullable=False),
+        sa.Column('authors', sa.String(), nullable=False),
+        sa.Column('engl_authors', sa.String(), nullable=False),
+        sa.Column('author_city_first', sa.String(), nullable=False),
+        sa.Column('author_city_second', sa.String(), nullable=False),
+        sa.Column('engl_author_city_first', sa.String(), nullable=False),
+        sa.Column('engl_author_city_second', sa.String(), nullable=False),
+        sa.Column('annotation', sa.String(), nullable=False),
+        sa.Column('keywords', sa.String(), nullable=False),
+        sa.Column('engl_annotation', sa.String(), nullable=False),
+        sa.Column('engl_keywords', sa.String(), nullable=False),
+        sa.Column('introduction', sa.String(), nullable=False),
+        sa.Column('theory', sa.String(), nullable=False),
+        sa.Column('results', sa.String(), nullable=False),
+        sa.Column('conclusion', sa.String(), nullable=False),
+        sa.Column('thanks', sa.String(), nullable=False),
+        sa.Column('list_of_sources', sa.String(), nullable=False),
+        sa.Column('doc_article', postgresql.BYTEA(), nullable=False),
+    )
+    _create_missing_table(
+        existing,
+        'events',
+        sa.Column('event_id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('content', sa.String(), nullable=False),
+        sa.Column('date', sa.String(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+    )
+    _create_missing_table(
+        existing,
+        'applications',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('event_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('event_name', sa.String(), nullable=False),
+        sa.Column('application_name', sa.String(), nullable=False),
+        sa.Column('content', sa.String(), nullable=False),
+        sa.Column('date', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+    )
+    _create_missing_table(
+        existing,
+        'comments',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('manager_id', postgresql.UUID(), nullable=True),
+        sa.Column('application_id', postgresql.UUID(), nullable=True),
+        sa.Column('manager_name', sa.String(), nullable=False),
+        sa.Column('manager_surname', sa.String(), nullable=False),
+        sa.Column('content', sa.String(), nullable=False),
+        sa.Column('date', sa.String(), nullable=False),
+    )
+    _create_missing_table(
+        existing,
+        'notifications',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('application_name', sa.String(), nullable=False),
+        sa.Column('application_id', postgresql.UUID(), nullable=True),
+        sa.Column('user_id', postgresql.UUID(), nullable=True),
+        sa.Column('status', sa.Boolean(), nullable=True),
+        sa.Column('date', sa.String(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('notifications')
+    op.drop_table('comments')
+    op.drop_table('applications')
+    op.drop_table('events')
+    op.drop_table('article')
+    op.drop_table('users')
@@ -0,0 +1,29 @@
+"""article render jobs
+
+Revision ID: 0002_article_render_jobs
+Revises: 0001_initial
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0002_article_render_jobs'
+down_revision = '0001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('article', sa.Column('render_status', sa.String(), nullable=False, server_default='done'))
+    op.add_column('article', sa.Column('render_error', sa.String(), nullable=True))
+    op.alter_column('article', 'doc_article', existing_type=postgresql.BYTEA(), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM article WHERE doc_article IS NULL")
+    op.alter_column('article', 'doc_article', existing_type=postgresql.BYTEA(), nullable=False)
+    op.drop_column('article', 'render_error')
+    op.drop_column('article', 'render_status')
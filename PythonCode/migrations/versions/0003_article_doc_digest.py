@@ -0,0 +1,30 @@
+"""article pdf digest for streamed downloads
+
+Revision ID: 0003_article_doc_digest
+Revises: 0002_article_render_jobs
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0003_article_doc_digest'
+down_revision = '0002_article_render_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('article', sa.Column('doc_sha256', sa.String(), nullable=True))
+    op.execute(
+        "UPDATE article SET doc_sha256 = encode(sha256(doc_article), 'hex') WHERE doc_article IS NOT NULL"
+    )
+    # PDFs are already compressed; storing them uncompressed lets substr() read
+    # a byte range without detoasting the whole value.
+    op.execute("ALTER TABLE article ALTER COLUMN doc_article SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE article ALTER COLUMN doc_article SET STORAGE EXTENDED")
+    op.drop_column('article', 'doc_sha256')
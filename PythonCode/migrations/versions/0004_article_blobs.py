@@ -0,0 +1,46 @@
+"""move article pdfs into a content-addressed blob table
+
+Revision ID: 0004_article_blobs
+Revises: 0003_article_doc_digest
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0004_article_blobs'
+down_revision = '0003_article_doc_digest'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'article_blobs',
+        sa.Column('sha256', sa.String(), primary_key=True),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('data', postgresql.BYTEA(), nullable=False),
+    )
+    op.execute("ALTER TABLE article_blobs ALTER COLUMN data SET STORAGE EXTERNAL")
+    op.execute(
+        "INSERT INTO article_blobs (sha256, size, data) "
+        "SELECT DISTINCT ON (doc_sha256) doc_sha256, octet_length(doc_article), doc_article "
+        "FROM article WHERE doc_article IS NOT NULL"
+    )
+    op.create_foreign_key(
+        'article_doc_sha256_fkey', 'article', 'article_blobs', ['doc_sha256'], ['sha256']
+    )
+    op.drop_column('article', 'doc_article')
+
+
+def downgrade() -> None:
+    op.add_column('article', sa.Column('doc_article', postgresql.BYTEA(), nullable=True))
+    op.execute("ALTER TABLE article ALTER COLUMN doc_article SET STORAGE EXTERNAL")
+    op.execute(
+        "UPDATE article SET doc_article = article_blobs.data "
+        "FROM article_blobs WHERE article_blobs.sha256 = article.doc_sha256"
+    )
+    op.drop_constraint('article_doc_sha256_fkey', 'article', type_='foreignkey')
+    op.drop_table('article_blobs')
@@ -0,0 +1,35 @@
+"""indexes for per-user and per-application lookups
+
+Revision ID: 0005_lookup_indexes
+Revises: 0004_article_blobs
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0005_lookup_indexes'
+down_revision = '0004_article_blobs'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_applications_user_id', 'applications', ['user_id']),
+    ('ix_comments_application_id', 'comments', ['application_id']),
+    ('ix_article_user_id', 'article', ['user_id']),
+    ('ix_notifications_user_id_status', 'notifications', ['user_id', 'status', 'id']),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tables writable while the indexes build, but cannot
+    # run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,41 @@
+"""full-text search vector for articles
+
+Revision ID: 0007_article_search
+Revises: 0006_user_token_version
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0007_article_search'
+down_revision = '0006_user_token_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('article', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    # Must match article_search_vector in db/dals.py.
+    op.execute("""
+        UPDATE article SET search_vector =
+            setweight(to_tsvector('russian', article_name), 'A') ||
+            setweight(to_tsvector('english', engl_article_name), 'A') ||
+            setweight(to_tsvector('russian', keywords), 'B') ||
+            setweight(to_tsvector('english', engl_keywords), 'B') ||
+            setweight(to_tsvector('russian', annotation), 'C') ||
+            setweight(to_tsvector('english', engl_annotation), 'C')
+    """)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_article_search_vector', 'article', ['search_vector'],
+            postgresql_using='gin', postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_article_search_vector', table_name='article', postgresql_concurrently=True)
+    op.drop_column('article', 'search_vector')
@@ -0,0 +1,32 @@
+"""trigram indexes for the user typeahead
+
+Revision ID: 0008_user_trigram_indexes
+Revises: 0007_article_search
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0008_user_trigram_indexes'
+down_revision = '0007_article_search'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ('name', 'surname', 'email')
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            op.create_index(
+                f'ix_users_{column}_trgm', 'users', [column],
+                postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}, postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in COLUMNS:
+            op.drop_index(f'ix_users_{column}_trgm', table_name='users', postgresql_concurrently=True)
@@ -0,0 +1,39 @@
+"""durable render job queue columns
+
+Revision ID: 0009_article_render_queue
+Revises: 0008_user_trigram_indexes
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0009_article_render_queue'
+down_revision = '0008_user_trigram_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('article', sa.Column('render_queued_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('article', sa.Column('render_started_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('article', sa.Column('render_attempts', sa.Integer(), nullable=False, server_default='0'))
+    # Jobs left unfinished by the old in-memory scheduler are picked up by the workers.
+    op.execute(
+        "UPDATE article SET render_status = 'queued', render_queued_at = now() "
+        "WHERE render_status IN ('queued', 'rendering')"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_article_render_queue', 'article', ['render_status', 'render_queued_at'],
+            postgresql_where=sa.text("render_status IN ('queued', 'rendering')"), postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_article_render_queue', table_name='article', postgresql_concurrently=True)
+    op.drop_column('article', 'render_attempts')
+    op.drop_column('article', 'render_started_at')
+    op.drop_column('article', 'render_queued_at')
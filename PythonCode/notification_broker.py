@@ -0,0 +1,120 @@
+import asyncio
+import json
+from contextlib import contextmanager
+from logging import getLogger
+from typing import Optional
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+import settings
+from cache import invalidate_auth_user, invalidate_responses
+
+logger = getLogger(__name__)
+
+# NOTIFY payloads are capped at 8000 bytes and an oversized one fails the whole
+# transaction, so only the ids travel; streams load the notification itself.
+NOTIFICATION_PAYLOAD_FIELDS = ("id", "user_id")
+NOTIFICATION_FIELDS = ("id", "application_id", "application_name", "user_id", "status", "date")
+
+
+def notification_payload(notification) -> str:
+    # Accepts a Notifications instance or a row returned from the notifications table.
+    return json.dumps({key: str(getattr(notification, key)) for key in NOTIFICATION_PAYLOAD_FIELDS})
+
+
+def notification_data(notification) -> str:
+    return json.dumps(
+        {key: getattr(notification, key) for key in NOTIFICATION_FIELDS},
+        default=str,
+        ensure_ascii=False,
+    )
+
+
+class NotificationBroker:
+    # Fans notifications out to the streams open in this process, keyed by user id.
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.published = 0
+        self.dropped = 0
+        self._subscribers = {}
+
+    @contextmanager
+    def subscribe(self, user_id: str):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user_id)
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[user_id]
+
+    def publish(self, payload: str):
+        user_id = json.loads(payload)["user_id"]
+        for queue in self._subscribers.get(str(user_id), ()):
+            try:
+                queue.put_nowait(payload)
+                self.published += 1
+            except asyncio.QueueFull:
+                # A client this far behind resyncs through /this_notification on reconnect.
+                self.dropped += 1
+
+    def stats(self) -> dict:
+        return {
+            "backend": settings.NOTIFICATIONS_BROKER,
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+class PostgresNotificationListener:
+    # One LISTEN connection per worker for all channels; every worker receives
+    # each NOTIFY and handles it locally, whichever worker committed.
+    def __init__(self, database_url: str, handlers: dict):
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.handlers = handlers
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self.handlers[channel](payload)
+
+    async def _listen(self):
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                try:
+                    closed = asyncio.Event()
+                    connection.add_termination_listener(lambda _: closed.set())
+                    for channel in self.handlers:
+                        await connection.add_listener(channel, self._on_notify)
+                    await closed.wait()
+                finally:
+                    await connection.close()
+                logger.warning("Notification listener connection lost, reconnecting")
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as err:
+                logger.warning("Notification listener failed, reconnecting: %s", err)
+            await asyncio.sleep(settings.NOTIFICATIONS_RECONNECT_SECONDS)
+
+
+notification_broker = NotificationBroker(settings.NOTIFICATION_STREAM_QUEUE_SIZE)
+notification_listener = PostgresNotificationListener(settings.REAL_DATABASE_URL, {
+    settings.NOTIFICATIONS_CHANNEL: notification_broker.publish,
+    settings.RESPONSE_CACHE_CHANNEL: invalidate_responses,
+    settings.AUTH_CACHE_CHANNEL: invalidate_auth_user,
+})
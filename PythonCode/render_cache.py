@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import pathlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import settings
+
+
+def article_cache_key(fields: dict, template_version: str) -> str:
+    payload = json.dumps(
+        {"template_version": template_version, "fields": fields}, sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    # Size-bounded LRU of rendered PDFs on disk, one file per content hash.
+    # Every method does blocking file I/O, call them through asyncio.to_thread.
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = pathlib.Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: Optional[OrderedDict] = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.directory / f"{key}.pdf"
+
+    def _load(self):
+        if self._entries is None:
+            self._scan()
+
+    def _scan(self):
+        # Rebuild the LRU order from file mtimes, which get() refreshes on every hit.
+        # Other workers may share the directory, so only the directory itself
+        # knows its size.
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = []
+        for path in self.directory.glob("*.pdf"):
+            try:
+                files.append((path.stat(), path.stem))
+            except FileNotFoundError:
+                pass
+        files.sort(key=lambda item: item[0].st_mtime)
+        self._entries = OrderedDict((key, stat.st_size) for stat, key in files)
+        self._size = sum(self._entries.values())
+
+    def _forget(self, key: str):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._size -= size
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._load()
+            path = self._path(key)
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                # Another worker sharing the directory may have evicted it.
+                self._forget(key)
+                self.misses += 1
+                return None
+            if key not in self._entries:
+                self._entries[key] = len(data)
+                self._size += len(data)
+            self._entries.move_to_end(key)
+            os.utime(path)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes):
+        if not self.enabled or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._load()
+            path = self._path(key)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+            # Recount rather than add to our own tally, which misses whatever other
+            # workers wrote. A scan costs far less than the render that led here.
+            self._scan()
+            while self._size > self.max_bytes:
+                old_key, old_size = self._entries.popitem(last=False)
+                self._size -= old_size
+                self._path(old_key).unlink(missing_ok=True)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries or ()),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+render_cache = RenderCache(settings.RENDER_CACHE_DIR, settings.RENDER_CACHE_MAX_BYTES)
@@ -0,0 +1,308 @@
+import asyncio
+import functools
+import hashlib
+import multiprocessing
+import os
+import pathlib
+import shutil
+import subprocess
+import tempfile
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from logging import getLogger
+from typing import Optional
+
+from pylatex import Document, Section, Subsection, Center, Package, Command, NewLine
+from pylatex.utils import NoEscape
+
+import settings
+from render_cache import render_cache, article_cache_key
+
+logger = getLogger(__name__)
+
+# Bump whenever build_article_document changes its output, so cached PDFs are not reused.
+ARTICLE_TEMPLATE_VERSION = "1"
+
+ARTICLE_FIELDS = (
+    'article_name', 'engl_article_name', 'authors', 'engl_authors', 'author_city_first', 'author_city_second',
+    'engl_author_city_first', 'engl_author_city_second', 'annotation', 'keywords', 'engl_annotation',
+    'engl_keywords', 'introduction', 'theory', 'results', 'conclusion', 'thanks', 'list_of_sources',
+)
+
+
+class RenderPoolBusy(Exception):
+    pass
+
+
+def normalize_article_fields(fields: dict) -> dict:
+    # Differences LaTeX would not render anyway (line endings, trailing blanks,
+    # unicode composition) must not produce distinct cache entries.
+    normalized = {}
+    for name in ARTICLE_FIELDS:
+        value = unicodedata.normalize('NFC', fields[name]).replace('\r\n', '\n').replace('\r', '\n')
+        normalized[name] = '\n'.join(line.rstrip() for line in value.split('\n')).strip()
+    return normalized
+
+
+def build_article_preamble() -> Document:
+    margins = {'tmargin': '20mm', 'lmargin': '25mm', 'rmargin': '25mm', 'bmargin': '20mm'}
+    doc = Document(documentclass='article', document_options=None, fontenc=['T2A', 'T1'], lmodern=None,
+                   textcomp=None, page_numbers=None, indent=True, font_size='normalsize', data=None,
+                   geometry_options=margins)
+    doc.packages.add(Package('babel', options=['english', 'russian']))
+    doc.packages.add(Package('newtxtext, newtxmath'))
+    doc.packages.add(Package('substitutefont'))
+    doc.preamble.append(NoEscape(r'\substitutefont{T2A}{/familydefault}{Tempora-TLF}'))
+    doc.packages.add(Package('lastpage'))
+    doc.packages.add(Package('indentfirst'))
+    doc.preamble.append(Command(r'linespread', arguments='1.5'))
+    doc.preamble.append(NoEscape(r'\setlength{\parindent}{5ex}'))
+    doc.preamble.append(NoEscape(r'\setlength{\parskip}{1ex}'))
+    return doc
+
+
+def build_article_document(fields: dict) -> Document:
+    annotation1 = 'Аннотация. ' + fields['annotation']
+    keywords1 = 'Ключевые слова: ' + fields['keywords']
+    engl_annotation1 = 'Abstract. ' + fields['engl_annotation']
+    engl_keywords1 = 'Keywords: ' + fields['engl_keywords']
+    doc = build_article_preamble()
+    doc.append(NoEscape(r'\pretolerance=10000'))
+    doc.append(NoEscape(r'\fontsize{12}{12pt}\selectfont'))
+
+    with doc.create(Center()) as center:
+        with center.create(Section(fields['article_name'], numbering=False)):
+            pass
+        with center.create(Section(fields['engl_article_name'], numbering=False)):
+            pass
+        with center.create(Subsection(fields['authors'], numbering=False)):
+            pass
+        with center.create(Subsection(fields['author_city_first'], numbering=False)):
+            pass
+        with center.create(Subsection(fields['author_city_second'], numbering=False)):
+            pass
+        with center.create(Subsection(fields['engl_authors'], numbering=False)):
+            pass
+        with center.create(Subsection(fields['engl_author_city_first'], numbering=False)):
+            pass
+        with center.create(Subsection(fields['engl_author_city_second'], numbering=False)):
+            pass
+
+    doc.append(NoEscape(r'\par'))
+    doc.append(annotation1)
+    doc.append(NewLine())
+    doc.append(NoEscape(r'\par'))
+    doc.append(keywords1)
+    doc.append(NewLine())
+    doc.append(NoEscape(r'\par'))
+    doc.append(engl_annotation1)
+    doc.append(NewLine())
+    doc.append(NoEscape(r'\par'))
+    doc.append(engl_keywords1)
+    doc.append(NewLine())
+
+    with doc.create(Subsection('Введение', numbering=False)):
+        doc.append(fields['introduction'])
+
+    with doc.create(Subsection('Теория', numbering=False)):
+        pass
+    doc.append(fields['theory'])
+    with doc.create(Subsection('Результаты', numbering=False)):
+        pass
+    doc.append(fields['results'])
+    with doc.create(Subsection('Выводы и заключение', numbering=False)):
+        pass
+    doc.append(fields['conclusion'])
+    with doc.create(Subsection('Источник финансирования. Благодарности', numbering=False)):
+        pass
+    doc.append(fields['thanks'])
+    with doc.create(Subsection('Список источников', numbering=False)):
+        pass
+    doc.append(fields['list_of_sources'])
+    return doc
+
+
+_broken_formats = set()
+
+
+@functools.lru_cache(maxsize=None)
+def _pdflatex_version() -> str:
+    try:
+        return subprocess.run(
+            ['pdflatex', '--version'], check=True, capture_output=True, text=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def ensure_article_format() -> Optional[str]:
+    # Dumps the fixed preamble into a pdflatex format with mylatexformat, so each
+    # article only compiles its body. The format name carries a hash of the
+    # preamble and of the pdflatex version, formats only load into the TeX build
+    # that dumped them, so a template change or a TeX upgrade builds a fresh one.
+    preamble = build_article_preamble().dumps().split(r'\begin{document}')[0]
+    digest = hashlib.sha256((_pdflatex_version() + preamble).encode('utf-8')).hexdigest()[:16]
+    format_dir = pathlib.Path(settings.RENDER_FORMAT_DIR).resolve()
+    name = f'article_preamble_{digest}'
+    if name in _broken_formats:
+        return None
+    if (format_dir / f'{name}.fmt').exists():
+        return str(format_dir / name)
+    format_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=format_dir) as build_dir:
+        pathlib.Path(build_dir, 'preamble.tex').write_text(
+            preamble + '\\begin{document}\n\\end{document}\n', encoding='utf-8'
+        )
+        try:
+            subprocess.run(
+                ['pdflatex', '-ini', '-interaction=nonstopmode', f'-jobname={name}',
+                 '&pdflatex', 'mylatexformat.ltx', 'preamble.tex'],
+                cwd=build_dir, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT,
+            )
+            # Other workers may race to build the same format, the rename keeps it atomic.
+            os.replace(os.path.join(build_dir, f'{name}.fmt'), format_dir / f'{name}.fmt')
+        except (OSError, subprocess.CalledProcessError) as err:
+            logger.warning("Could not build the article preamble format, compiling cold: %s", err)
+            _broken_formats.add(name)
+            return None
+    return str(format_dir / name)
+
+
+def _render_build_root() -> Optional[str]:
+    if settings.RENDER_BUILD_ROOT:
+        return settings.RENDER_BUILD_ROOT
+    # pdflatex writes several intermediate files per run, keep them in memory when we can.
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return None
+
+
+def render_article_pdf(fields: dict, use_format: bool = settings.RENDER_PRECOMPILED_PREAMBLE) -> bytes:
+    # Runs inside a worker process of the render pool, never on the event loop.
+    doc = build_article_document(fields)
+    format_path = ensure_article_format() if use_format else None
+    if format_path is not None:
+        try:
+            return _compile_article(doc, [f'-fmt={format_path}'])
+        except subprocess.CalledProcessError as err:
+            logger.warning("Compiling with the preamble format %s failed, retrying cold: %s", format_path, err)
+        pdf = _compile_article(doc, [])
+        # The article is fine, so the format is the problem, stop using it in this worker.
+        _broken_formats.add(os.path.basename(format_path))
+        return pdf
+    return _compile_article(doc, [])
+
+
+def _compile_article(doc: Document, compiler_args: list) -> bytes:
+    build_dir = tempfile.mkdtemp(prefix='article_', dir=_render_build_root())
+    try:
+        # The whole build directory is removed afterwards, no need for pylatex to clean it.
+        doc.generate_pdf(os.path.join(build_dir, 'article'), clean=False, clean_tex=False, compiler='pdflatex',
+                         compiler_args=compiler_args)
+        return pathlib.Path(build_dir, 'article.pdf').read_bytes()
+    except Exception:
+        if settings.RENDER_KEEP_FAILED_BUILDS:
+            os.makedirs(settings.RENDER_FAILED_BUILD_DIR, exist_ok=True)
+            kept_dir = shutil.move(build_dir, settings.RENDER_FAILED_BUILD_DIR)
+            logger.error("Article render failed, build kept in %s", kept_dir)
+            build_dir = None
+        raise
+    finally:
+        if build_dir is not None:
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+
+class RenderPool:
+    def __init__(self, max_concurrency: int, max_queue_depth: int):
+        self.max_concurrency = max_concurrency
+        self.max_queue_depth = max_queue_depth
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        self._inflight = {}
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Workers start lazily, when the server already runs threads, so they
+            # must not be forked from it (fork is the Linux default before 3.14).
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_concurrency, mp_context=multiprocessing.get_context(start_method)
+            )
+        return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        # A worker that died (OOM killer, crash) breaks the whole pool for good,
+        # the next render starts a fresh one.
+        if self._executor is executor:
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def render(self, fields: dict) -> bytes:
+        fields = normalize_article_fields(fields)
+        key = article_cache_key(fields, ARTICLE_TEMPLATE_VERSION)
+        # Identical submissions arriving while the first one is still in progress share its result.
+        task = self._inflight.get(key)
+        if task is None:
+            # Renders beyond the concurrency limit wait in the queue; once the queue
+            # is full as well the caller is told to come back later.
+            if self._pending >= self.max_concurrency + self.max_queue_depth:
+                raise RenderPoolBusy(
+                    f"Article renderer is busy ({self._pending} renders in progress or queued)"
+                )
+            # Counted before the first await, so whoever decides whether to hand
+            # the pool more work already sees this render.
+            self._pending += 1
+            task = asyncio.create_task(self._render_and_store(key, fields))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _render_and_store(self, key: str, fields: dict) -> bytes:
+        try:
+            try:
+                doc_article = await asyncio.to_thread(render_cache.get, key)
+            except OSError as err:
+                logger.warning("Could not read the render cache, rendering %s: %s", key, err)
+                doc_article = None
+            if doc_article is not None:
+                return doc_article
+            async with self._get_semaphore():
+                loop = asyncio.get_running_loop()
+                executor = self._get_executor()
+                try:
+                    doc_article = await loop.run_in_executor(executor, render_article_pdf, fields)
+                except BrokenProcessPool:
+                    # The render may just have shared the pool with the one that crashed it, retry once.
+                    logger.warning("Render pool broke, restarting it")
+                    self._discard_executor(executor)
+                    doc_article = await loop.run_in_executor(self._get_executor(), render_article_pdf, fields)
+        finally:
+            self._pending -= 1
+        try:
+            await asyncio.to_thread(render_cache.put, key, doc_article)
+        except OSError as err:
+            # The cache is best-effort, a full or unwritable disk must not cost a finished render.
+            logger.warning("Could not store rendered article %s in the render cache: %s", key, err)
+        return doc_article
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+render_pool = RenderPool(
+    max_concurrency=settings.RENDER_MAX_CONCURRENCY,
+    max_queue_depth=settings.RENDER_QUEUE_DEPTH,
+)
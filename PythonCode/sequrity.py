@@ -1,9 +1,95 @@
+import pathlib
+import time
 from datetime import datetime, timedelta
+from logging import getLogger
 from typing import Optional
-from jose import jwt
+from jose import jwk, jwt, JWTError
+from jose.exceptions import JOSEError
 
 import settings
 
+logger = getLogger(__name__)
+
+# Bump when the claims below change shape; tokens with another version fall back to a database lookup.
+TOKEN_CLAIMS_VERSION = 1
+
+
+def access_token_claims(user) -> dict:
+    return {
+        "sub": user.email,
+        "user_id": str(user.user_id),
+        "roles": user.roles,
+        "tv": user.token_version,
+        "cv": TOKEN_CLAIMS_VERSION,
+    }
+
+
+class SigningKeys:
+    # Parsed asymmetric keys from JWT_KEYS_DIR: <kid>.pem holds a private key that
+    # can sign, <kid>.pub.pem a retired public key kept to verify tokens still in
+    # flight. Keys are parsed once and reused for every token, and the directory
+    # is read again every JWT_KEYS_RELOAD_SECONDS to pick up rotated keys.
+    def __init__(self, directory: str, algorithm: str):
+        self.directory = pathlib.Path(directory)
+        self.algorithm = algorithm
+        self._private_keys = {}
+        self._public_keys = {}
+        self._loaded_at = None
+
+    def load(self):
+        private_keys, public_keys = {}, {}
+        for path in sorted(self.directory.glob("*.pem")):
+            key = jwk.construct(path.read_text(), self.algorithm)
+            if path.name.endswith(".pub.pem"):
+                public_keys[path.name[:-len(".pub.pem")]] = key
+            else:
+                kid = path.stem
+                private_keys[kid] = key
+                public_keys[kid] = key.public_key()
+        self._private_keys, self._public_keys = private_keys, public_keys
+        self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        if self._loaded_at is None:
+            self.load()
+        elif time.monotonic() - self._loaded_at > settings.JWT_KEYS_RELOAD_SECONDS:
+            try:
+                self.load()
+            except (OSError, JOSEError, ValueError) as err:
+                # Most likely a key file caught half-written, keep the keys we have and retry later.
+                logger.warning("Reloading JWT keys from %s failed: %s", self.directory, err)
+                self._loaded_at = time.monotonic()
+
+    def signing_key(self):
+        self._ensure_loaded()
+        kid = settings.JWT_ACTIVE_KID or max(self._private_keys, default=None)
+        if kid not in self._private_keys:
+            raise RuntimeError(f"No private JWT signing key {kid!r} in {self.directory}")
+        return kid, self._private_keys[kid]
+
+    def verification_key(self, kid: Optional[str]):
+        self._ensure_loaded()
+        key = self._public_keys.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown signing key id {kid!r}")
+        return key
+
+    def jwks(self) -> dict:
+        self._ensure_loaded()
+        return {
+            "keys": [
+                {**key.to_dict(), "kid": kid, "use": "sig", "alg": self.algorithm}
+                for kid, key in self._public_keys.items()
+            ]
+        }
+
+
+def is_asymmetric() -> bool:
+    return not settings.ALGORITHM.startswith("HS")
+
+
+signing_keys = SigningKeys(settings.JWT_KEYS_DIR, settings.ALGORITHM)
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -12,5 +98,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
+    if is_asymmetric():
+        kid, key = signing_keys.signing_key()
+        return jwt.encode(to_encode, key, algorithm=settings.ALGORITHM, headers={"kid": kid})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
+
+
+def decode_access_token(token: str) -> dict:
+    if is_asymmetric():
+        key = signing_keys.verification_key(jwt.get_unverified_header(token).get("kid"))
+        return jwt.decode(token, key, algorithms=[settings.ALGORITHM])
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
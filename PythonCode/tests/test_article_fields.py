@@ -0,0 +1,19 @@
+import pytest
+from fastapi import HTTPException
+
+from api.models import ARTICLE_LIST_FIELDS, ARTICLE_SUMMARY_FIELDS, parse_article_fields
+
+
+def test_parse_article_fields_defaults():
+    assert parse_article_fields(None, summary=True) == list(ARTICLE_SUMMARY_FIELDS)
+    assert parse_article_fields(None, summary=False) == list(ARTICLE_LIST_FIELDS)
+
+
+def test_parse_article_fields_keeps_article_id_first():
+    assert parse_article_fields("keywords, article_id,keywords", summary=True) == ["article_id", "keywords"]
+
+
+def test_parse_article_fields_unknown():
+    with pytest.raises(HTTPException) as err:
+        parse_article_fields("keywords,search_vector", summary=True)
+    assert err.value.status_code == 422
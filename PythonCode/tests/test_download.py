@@ -0,0 +1,47 @@
+import pytest
+
+from api.actions.download import RangeNotSatisfiable, etag_matches, parse_byte_range
+
+
+@pytest.mark.parametrize("range_header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=10-", (10, 999)),
+    ("bytes=900-5000", (900, 999)),
+    ("bytes=-100", (900, 999)),
+    ("bytes=-5000", (0, 999)),
+])
+def test_parse_byte_range(range_header, expected):
+    assert parse_byte_range(range_header, 1000) == expected
+
+
+@pytest.mark.parametrize("range_header", [
+    None, "", "items=0-10", "bytes=0-10,20-30", "bytes=a-b", "bytes=500-100", "bytes=--5", "bytes=+1-",
+    "bytes=1_0-20", "bytes=1- 2", "bytes=-+5", "bytes=5", "bytes=-", "bytes=\u00b2-",
+])
+def test_parse_byte_range_serves_full_body(range_header):
+    assert parse_byte_range(range_header, 1000) is None
+
+
+@pytest.mark.parametrize("range_header", ["bytes=1000-", "bytes=2000-3000", "bytes=-0"])
+def test_parse_byte_range_not_satisfiable(range_header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_byte_range(range_header, 1000)
+
+
+@pytest.mark.parametrize("range_header", ["bytes=0-", "bytes=-5"])
+def test_parse_byte_range_empty_body(range_header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_byte_range(range_header, 0)
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"other", W/"abc"', True),
+    ("*", True),
+    ('"other"', False),
+    ('W/"other"', False),
+])
+def test_etag_matches(if_none_match, expected):
+    assert etag_matches(if_none_match, '"abc"') is expected
@@ -0,0 +1,48 @@
+import os
+
+from render_cache import RenderCache
+
+
+def _age(cache: RenderCache, key: str, mtime: float):
+    os.utime(cache.directory / f"{key}.pdf", (mtime, mtime))
+
+
+def test_render_cache_round_trip(tmp_path):
+    render_cache = RenderCache(str(tmp_path), max_bytes=1000)
+    assert render_cache.get("a") is None
+    render_cache.put("a", b"pdf")
+    assert render_cache.get("a") == b"pdf"
+    assert render_cache.stats()["hits"] == 1
+    assert render_cache.stats()["misses"] == 1
+
+
+def test_render_cache_evicts_least_recently_used(tmp_path):
+    render_cache = RenderCache(str(tmp_path), max_bytes=300)
+    for mtime, key in enumerate("abc"):
+        render_cache.put(key, b"x" * 100)
+        _age(render_cache, key, 1000 + mtime)
+    # The hit makes "a" the most recently used file.
+    assert render_cache.get("a") is not None
+    render_cache.put("d", b"x" * 100)
+    assert sorted(path.stem for path in tmp_path.glob("*.pdf")) == ["a", "c", "d"]
+    assert render_cache.stats()["evictions"] == 1
+
+
+def test_render_cache_shared_directory_stays_bounded(tmp_path):
+    first = RenderCache(str(tmp_path), max_bytes=300)
+    second = RenderCache(str(tmp_path), max_bytes=300)
+    for mtime, key in enumerate("abcdef"):
+        (first if mtime % 2 else second).put(key, b"x" * 100)
+        _age(first, key, 1000 + mtime)
+    assert sum(path.stat().st_size for path in tmp_path.glob("*.pdf")) == 300
+    assert sorted(path.stem for path in tmp_path.glob("*.pdf")) == ["d", "e", "f"]
+
+
+def test_render_cache_skips_oversized_and_disabled(tmp_path):
+    render_cache = RenderCache(str(tmp_path), max_bytes=10)
+    render_cache.put("big", b"x" * 11)
+    assert render_cache.get("big") is None
+    disabled = RenderCache(str(tmp_path / "off"), max_bytes=0)
+    disabled.put("a", b"pdf")
+    assert disabled.get("a") is None
+    assert not (tmp_path / "off").exists()
@@ -0,0 +1,19 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from api.models import parse_search_cursor
+
+
+def test_parse_search_cursor():
+    article_id = uuid.uuid4()
+    assert parse_search_cursor(None) is None
+    assert parse_search_cursor(f"0.25:{article_id}") == (0.25, article_id)
+
+
+@pytest.mark.parametrize("after", ["", "0.25", "abc:def", f"0.25:{uuid.uuid4()}extra", f"x:{uuid.uuid4()}"])
+def test_parse_search_cursor_invalid(after):
+    with pytest.raises(HTTPException) as err:
+        parse_search_cursor(after)
+    assert err.value.status_code == 422
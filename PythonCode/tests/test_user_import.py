@@ -0,0 +1,49 @@
+import pytest
+from fastapi import HTTPException
+
+from api.actions.user_import import _iter_import_rows
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _rows(is_csv: bool, *chunks: bytes) -> list:
+    return [row async for row in _iter_import_rows(_chunks(*chunks), is_csv)]
+
+
+@pytest.mark.asyncio
+async def test_csv_rows_split_across_chunks():
+    rows = await _rows(True, b"name,surname,age,email,pass", b"word\nAnn,Lee,30,ann@", b"example.com,secret\n")
+    assert rows == [
+        (2, {"name": "Ann", "surname": "Lee", "age": "30", "email": "ann@example.com", "password": "secret"}, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_malformed_rows():
+    rows = await _rows(True, b"name,surname,age,email,password\n\n\xff\xfe\n\"Ann,Lee\n")
+    number, fields, error = rows[0]
+    assert (number, fields) == (3, None) and "utf-8" in error
+    # Short rows get through with the columns they have, UserCreate rejects them.
+    assert rows[1] == (4, {"name": "Ann,Lee"}, None)
+    assert len(rows) == 2
+
+
+@pytest.mark.asyncio
+async def test_csv_header_missing_columns():
+    with pytest.raises(HTTPException) as err:
+        await _rows(True, b"name,email\nAnn,ann@example.com\n")
+    assert err.value.status_code == 422
+    assert "surname" in err.value.detail
+
+
+@pytest.mark.asyncio
+async def test_ndjson_malformed_rows():
+    rows = await _rows(False, b'{"name": "Ann"}\n[1, 2]\n{"name": \n\n"text"\n')
+    assert rows[0] == (1, {"name": "Ann"}, None)
+    assert rows[1] == (2, None, "Expected a JSON object")
+    assert rows[2][0] == 3 and rows[2][1] is None and rows[2][2]
+    assert rows[3] == (5, None, "Expected a JSON object")
+    assert len(rows) == 4